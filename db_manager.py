@@ -95,6 +95,8 @@ class DatabaseManager:
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # file path -> ((st_size, st_mtime_ns), md5) for get_file_hash
+        self._file_hash_cache: Dict[str, tuple] = {}
         self._init_database()
 
     @contextmanager
@@ -402,6 +404,14 @@ class DatabaseManager:
                 )
             """)
 
+            # Migration: size/mtime of the file as synced, so unchanged files are
+            # recognised from a stat without hashing them again
+            for column in ("file_size INTEGER", "file_mtime_ns INTEGER"):
+                try:
+                    cursor.execute(f"ALTER TABLE notion_sync ADD COLUMN {column}")
+                except sqlite3.OperationalError:
+                    pass  # Column likely already exists
+
             # Schedule tracking - controls frequency of different operations
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS schedule_tracker (
@@ -914,18 +924,31 @@ class DatabaseManager:
     # ==========================================
 
     def get_file_hash(self, file_path: str) -> str:
-        """Calculate a simple hash of file contents for change detection."""
+        """Calculate a simple hash of file contents for change detection.
+
+        Hashes are remembered against the file's size and mtime, so a file that
+        has not changed since it was last hashed is not read again.
+        """
         import hashlib
 
         try:
+            st = os.stat(file_path)
+            stat_key = (st.st_size, st.st_mtime_ns)
+            cached = self._file_hash_cache.get(file_path)
+            if cached and cached[0] == stat_key:
+                return cached[1]
             with open(file_path, "rb") as f:
-                return hashlib.md5(f.read()).hexdigest()
+                digest = hashlib.md5(f.read()).hexdigest()
+            self._file_hash_cache[file_path] = (stat_key, digest)
+            return digest
         except Exception:
             return ""
 
     def is_file_synced(self, file_path: str) -> bool:
         """Check if a file has been synced to Notion and hasn't changed.
 
+        A file whose size and mtime still match the recorded sync is unchanged
+        without being read.
         If `file_hash` is provided, compare against the stored sync fingerprint
         (useful when publishing uses a computed strong fingerprint instead of raw
         file bytes). If not provided, fall back to the existing MD5-of-file check.
@@ -939,7 +962,7 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT file_hash FROM notion_sync WHERE file_path = ?
+                SELECT file_hash, file_size, file_mtime_ns FROM notion_sync WHERE file_path = ?
             """,
                 (normalized_path,),
             )
@@ -948,6 +971,15 @@ class DatabaseManager:
             if not row:
                 return False
 
+            # Same size and mtime as when it was synced: unchanged, no need to hash
+            if row["file_mtime_ns"] is not None:
+                try:
+                    st = os.stat(normalized_path)
+                    if (st.st_size, st.st_mtime_ns) == (row["file_size"], row["file_mtime_ns"]):
+                        return True
+                except OSError:
+                    pass
+
             stored_hash = row["file_hash"]
 
             # If caller provided an explicit fingerprint, compare that
@@ -961,6 +993,9 @@ class DatabaseManager:
     def record_notion_sync(self, file_path: str, page_id: str, url: str, doc_type: str = None, file_hash: str | None = None) -> bool:
         """Record that a file has been synced to Notion.
 
+        The file's current size and mtime are stored with the row, so record
+        after any final write to the file (e.g. the notion_page_id frontmatter).
+
         If `file_hash` is provided it will be stored as the canonical fingerprint
         for deduplication. This allows the publisher to write a computed strong
         fingerprint (title + body + frontmatter) rather than a raw MD5 of the
@@ -977,19 +1012,27 @@ class DatabaseManager:
                 file_hash = self.get_file_hash(normalized_path)
 
             now = datetime.now().isoformat()
+            try:
+                st = os.stat(normalized_path)
+                file_size, file_mtime_ns = st.st_size, st.st_mtime_ns
+            except OSError:
+                file_size = file_mtime_ns = None
 
             cursor.execute(
                 """
-                INSERT INTO notion_sync (file_path, file_hash, notion_page_id, notion_url, doc_type, synced_at)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO notion_sync (file_path, file_hash, notion_page_id, notion_url, doc_type, synced_at,
+                                         file_size, file_mtime_ns)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(file_path) DO UPDATE SET
                     file_hash = excluded.file_hash,
                     notion_page_id = excluded.notion_page_id,
                     notion_url = excluded.notion_url,
                     doc_type = excluded.doc_type,
-                    synced_at = excluded.synced_at
+                    synced_at = excluded.synced_at,
+                    file_size = excluded.file_size,
+                    file_mtime_ns = excluded.file_mtime_ns
             """,
-                (normalized_path, file_hash, page_id, url, doc_type, now),
+                (normalized_path, file_hash, page_id, url, doc_type, now, file_size, file_mtime_ns),
             )
 
             # Also update document lifecycle table to mark this file as published
@@ -20,8 +20,10 @@ Supports: imgbb (free), local file serving, or direct Notion upload.
 import base64
 import hashlib
 import json
+import logging
 import os
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -56,6 +58,10 @@ CHART_DIRS = [
 # Cache file for uploaded URLs
 CACHE_FILE = PROJECT_ROOT / "output" / "chart_urls.json"
 
+# Serializes updates of CACHE_FILE between threads (e.g. Notion sync workers);
+# uploads themselves run outside it
+_CACHE_LOCK = threading.Lock()
+
 # Ticker patterns to detect in content
 TICKER_MAP = {
     "GOLD": ["GOLD", "XAUUSD", "GC=F", "gold", "Gold"],
@@ -89,7 +95,10 @@ class ChartPublisher:
         """Save cache to file."""
         self.cache["last_updated"] = datetime.now().isoformat()
         CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        CACHE_FILE.write_text(json.dumps(self.cache, indent=2))
+        # Replace in one step so concurrent readers never see a partial file
+        tmp = CACHE_FILE.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.cache, indent=2))
+        tmp.replace(CACHE_FILE)
 
     def _get_file_hash(self, filepath: Path) -> str:
         """Get MD5 hash of file for change detection."""
@@ -135,7 +144,7 @@ class ChartPublisher:
     def upload_to_imgbb(self, filepath: Path, name: str = None) -> Optional[str]:
         """Upload image to imgbb and return URL."""
         if not self.api_key:
-            print("⚠ No IMGBB_API_KEY set - using local file reference")
+            logging.warning("No IMGBB_API_KEY set - using local file reference")
             return None
 
         # Check limits before uploading
@@ -146,7 +155,7 @@ class ChartPublisher:
             cleanup = CleanupManager()
             can_upload, reason = cleanup.should_upload_chart(file_size)
             if not can_upload:
-                print(f"⚠ Skipping upload: {reason}")
+                logging.warning("Skipping upload: %s", reason)
                 return self._get_cached_url_for_file(filepath)
         except ImportError:
             pass  # Cleanup manager not available, proceed anyway
@@ -178,11 +187,11 @@ class ChartPublisher:
                         pass
                     return data["data"]["url"]
 
-            print(f"⚠ Upload failed for {filepath.name}: {response.text[:100]}")
+            logging.warning("Upload failed for %s: %s", filepath.name, response.text[:100])
             return None
 
         except Exception as e:
-            print(f"⚠ Upload error for {filepath.name}: {e}")
+            logging.warning("Upload error for %s: %s", filepath.name, e)
             return None
 
     def upload_chart(self, filepath: Path, force: bool = False) -> Optional[str]:
@@ -200,13 +209,16 @@ class ChartPublisher:
         url = self.upload_to_imgbb(filepath)
 
         if url:
-            self.cache["charts"][cache_key] = {
-                "url": url,
-                "hash": file_hash,
-                "uploaded": datetime.now().isoformat(),
-                "ticker": filepath.stem.split("_")[0].upper(),
-            }
-            self._save_cache()
+            with _CACHE_LOCK:
+                # Add to the file as saved by other threads since this instance loaded it
+                self.cache = self._load_cache()
+                self.cache["charts"][cache_key] = {
+                    "url": url,
+                    "hash": file_hash,
+                    "uploaded": datetime.now().isoformat(),
+                    "ticker": filepath.stem.split("_")[0].upper(),
+                }
+                self._save_cache()
 
         return url
 
@@ -219,7 +231,7 @@ class ChartPublisher:
             url = self.upload_chart(filepath, force=force)
             if url:
                 urls[ticker] = url
-                print(f"📊 {ticker}: {url[:50]}...")
+                logging.info("📊 %s: %s...", ticker, url[:50])
             else:
                 # Fallback: use local file path (won't work in Notion but good for testing)
                 urls[ticker] = f"file://{filepath}"
@@ -233,7 +245,7 @@ class ChartPublisher:
         if not tickers:
             return {}
 
-        print(f"📈 Detected tickers: {', '.join(tickers)}")
+        logging.info("📈 Detected tickers: %s", ", ".join(tickers))
         return self.upload_charts_for_tickers(tickers, force=force_upload)
 
     def get_cached_url(self, ticker: str) -> Optional[str]:
@@ -310,6 +322,7 @@ if __name__ == "__main__":
     parser.add_argument("--list", action="store_true", help="List cached chart URLs")
     parser.add_argument("--force", action="store_true", help="Force re-upload")
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     if args.setup:
         setup_imgbb_key()
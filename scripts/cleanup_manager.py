@@ -20,6 +20,7 @@ Implements smart retention policies and usage tracking.
 import json
 import os
 import sys
+import threading
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -47,6 +48,9 @@ except Exception:
 USAGE_FILE = PROJECT_ROOT / "output" / "usage_stats.json"
 CHART_CACHE = PROJECT_ROOT / "output" / "chart_urls.json"
 
+# Serializes load-modify-save of USAGE_FILE between threads (e.g. sync workers)
+_USAGE_LOCK = threading.Lock()
+
 # Limits (free tier)
 LIMITS = {
     "imgbb": {"monthly_mb": 32, "description": "32MB/month uploads"},
@@ -109,7 +113,10 @@ class CleanupManager:
     def _save_stats(self):
         """Save usage statistics."""
         USAGE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        USAGE_FILE.write_text(json.dumps(self.stats.to_dict(), indent=2))
+        # Replace in one step so concurrent readers never see a partial file
+        tmp = USAGE_FILE.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.stats.to_dict(), indent=2))
+        tmp.replace(USAGE_FILE)
 
     def _check_monthly_reset(self):
         """Reset monthly counters if new month."""
@@ -121,19 +128,25 @@ class CleanupManager:
             self.stats.imgbb_bytes_this_month = 0
             self.stats.imgbb_uploads_this_month = 0
             self.stats.last_reset = current_month
-            self._save_stats()
+            with _USAGE_LOCK:
+                self._save_stats()
 
     def record_imgbb_upload(self, file_size_bytes: int):
         """Record an imgbb upload."""
-        self.stats.imgbb_bytes_this_month += file_size_bytes
-        self.stats.imgbb_uploads_this_month += 1
-        self._save_stats()
+        with _USAGE_LOCK:
+            # Count on top of the file as saved by other threads since loading
+            self.stats = self._load_stats()
+            self.stats.imgbb_bytes_this_month += file_size_bytes
+            self.stats.imgbb_uploads_this_month += 1
+            self._save_stats()
 
     def record_notion_page(self, block_count: int):
         """Record a Notion page creation."""
-        self.stats.notion_pages_created += 1
-        self.stats.notion_blocks_created += block_count
-        self._save_stats()
+        with _USAGE_LOCK:
+            self.stats = self._load_stats()
+            self.stats.notion_pages_created += 1
+            self.stats.notion_blocks_created += block_count
+            self._save_stats()
 
     def get_imgbb_usage(self) -> Tuple[float, float]:
         """Get imgbb usage: (used_mb, limit_mb)."""
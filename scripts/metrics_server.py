@@ -18,10 +18,11 @@ Run alongside the daemon with: python scripts/metrics_server.py
 """
 
 import os
+import socket
 import sys
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Add project root to path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -98,6 +99,27 @@ class MetricsHandler(BaseHTTPRequestHandler):
         pass
 
 
+class ReusePortHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server that shares its port with sibling instances.
+
+    With SO_REUSEPORT the kernel load-balances incoming scrapes across every
+    process bound to the port, so several daemons can expose metrics on the
+    same address and a replacement can bind before the old one exits.
+    Platforms without SO_REUSEPORT (e.g. Windows) fall back to a normal bind.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def server_bind(self):
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        super().server_bind()
+
+
 def increment_completion():
     """Increment task completion counter."""
     global task_completions, last_execution_time
@@ -114,7 +136,7 @@ def increment_failure():
 
 def run_server():
     """Start the metrics HTTP server."""
-    server = HTTPServer((METRICS_HOST, METRICS_PORT), MetricsHandler)
+    server = ReusePortHTTPServer((METRICS_HOST, METRICS_PORT), MetricsHandler)
     print(f"🔬 Metrics server running at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
     server.serve_forever()
 
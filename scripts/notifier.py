@@ -40,6 +40,7 @@ def send_discord(message: str = None, webhook_url: Optional[str] = None, embed:
     import time
     attempts = 3
     delay = 1.0
+    last_exc = None
     for attempt in range(1, attempts + 1):
         try:
             r = requests.post(url, json=payload, timeout=10)
@@ -59,11 +60,17 @@ def send_discord(message: str = None, webhook_url: Optional[str] = None, embed:
             else:
                 logging.warning("Discord webhook returned unexpected response object on attempt %s: %r", attempt, r)
         except Exception as e:
-            logging.exception("Failed to send Discord webhook on attempt %s: %s", attempt, e)
+            # Keep retryable attempts cheap; the traceback is logged once below
+            last_exc = e
+            logging.warning("Discord webhook attempt %s failed: %r", attempt, e)
 
         if attempt < attempts:
             time.sleep(delay)
             delay *= 2
 
-    logging.error("Discord webhook failed after %s attempts", attempts)
+    logging.error(
+        "Discord webhook failed after %s attempts",
+        attempts,
+        exc_info=(type(last_exc), last_exc, last_exc.__traceback__) if last_exc else None,
+    )
     return False
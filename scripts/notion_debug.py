@@ -37,7 +37,8 @@ if not api_key or not db_id:
 
 client = Client(auth=api_key)
 
-# Patterns to search
+# Patterns to search. "Journal" and "PreMarket" already match the
+# "Journal_*" and "PreMarket_*" titles, so those get no search of their own.
 patterns = [
     "Journal",
     "PreMarket",
@@ -47,36 +48,34 @@ patterns = [
     "Catalysts",
     "InstMatrix",
     "FILE_INDEX",
-    "Journal_",
-    "PreMarket_",
 ]
 
-pages = []
+
+def _page_title(p):
+    props = p.get("properties", {})
+    name_prop = props.get("Name") or props.get("title")
+    if name_prop:
+        return name_prop.get("title", [{}])[0].get("plain_text", "Untitled")
+    return "Untitled"
+
+
+# One workspace search per pattern; pages matched by several patterns
+# are kept once, in first-seen order.
+seen = set()
+dedup = []
 for pat in patterns:
     start_cursor = None
     while True:
         resp = client.search(query=pat, page_size=100, start_cursor=start_cursor)
         for p in resp.get("results", []) or []:
-            if p.get("object") != "page":
+            if p.get("object") != "page" or p["id"] in seen:
                 continue
-            title = "Untitled"
-            props = p.get("properties", {})
-            name_prop = props.get("Name") or props.get("title")
-            if name_prop:
-                title = name_prop.get("title", [{}])[0].get("plain_text", "Untitled")
-            pages.append({"id": p["id"], "title": title, "parent": p.get("parent", {})})
+            seen.add(p["id"])
+            dedup.append({"id": p["id"], "title": _page_title(p), "parent": p.get("parent", {})})
         start_cursor = resp.get("next_cursor")
         if not start_cursor:
             break
 
-# Deduplicate by id
-ids = set()
-dedup = []
-for p in pages:
-    if p["id"] not in ids:
-        ids.add(p["id"])
-        dedup.append(p)
-
 print(f"Found {len(dedup)} pages:")
 for p in dedup:
     print(f"- {p['title']} ({p['id']}) parent: {p['parent']}")
@@ -22,7 +22,8 @@ to create professional-looking pages.
 import html as _html
 import re
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 
 
 class BlockColor(Enum):
@@ -89,6 +90,10 @@ SECTION_EMOJIS = {
     "default": "📌",
 }
 
+# (keyword, emoji) pairs scanned by get_section_emoji. Dict order is the
+# match priority, so headings naming several keywords keep their emoji.
+_SECTION_EMOJI_ITEMS = tuple((k, v) for k, v in SECTION_EMOJIS.items() if k != "default")
+
 # Document type emoji mapping
 DOC_TYPE_EMOJIS = {
     "journal": "📓",
@@ -117,14 +122,74 @@ BIAS_BG_COLORS = {
     "NEUTRAL": BlockColor.YELLOW_BG,
 }
 
+# Plain color strings resolved once, so color_for_bias skips Enum.value lookups
+_BIAS_COLOR_VALUES = {bias: color.value for bias, color in BIAS_COLORS.items()}
+_BIAS_BG_COLOR_VALUES = {bias: color.value for bias, color in BIAS_BG_COLORS.items()}
+_DEFAULT_COLOR = BlockColor.DEFAULT.value
+
+# Compiled patterns (the formatter runs several of these per markdown line)
+# Block-level line classifier. Alternatives are tried in priority order and
+# each is wrapped in an outer named group so ``match.lastgroup`` names the kind.
+_RE_LINE_KIND = re.compile(
+    r"(?P<header>(?P<hlevel>#{1,3})\s+(?P<htext>.+)$)"
+    r"|(?P<hr>(?:---+|\*\*\*+)$)"
+    r"|(?P<fence>```)"
+    r"|(?P<table>\|)"
+    r"|(?P<quote>>)"
+    r"|(?P<bullet>[-*]\s+(?P<btext>.+)$)"
+    r"|(?P<num>\d+\.\s+(?P<ntext>.+)$)"
+)
+_TABLE_SEP_CHARS = frozenset("|-: \t")
+
+# Notion rejects rich text content longer than this, so coalesced
+# paragraphs are split before reaching it.
+_MAX_PARAGRAPH_CHARS = 2000
+# A tag, or a character reference using the same grammar as html.unescape
+_RE_HTML_TAG_OR_ENTITY = re.compile(r"<[^>]+>|&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)")
+_RE_TABLE = re.compile(r"<table[^>]*>.*?</table>", re.S | re.I)
+_RE_TR = re.compile(r"<tr[^>]*>(.*?)</tr>", re.S | re.I)
+_RE_TD = re.compile(r"<t[dh][^>]*>(.*?)</t[dh]>", re.S | re.I)
+_RE_TH = re.compile(r"<th[^>]*>(.*?)</th>", re.S | re.I)
+_RE_PRICE = re.compile(r"\$[\d,]+")
+_RE_INDICATOR = re.compile(r"\b(RSI|ADX|ATR|SMA|EMA|MACD)\b")
+_RE_BIAS_FM = re.compile(r"bias:\s*(\w+)", re.IGNORECASE)
+
+# Keywords used to color bullets and to pick callout styles for blockquotes
+# (plain substring matches, one scan per category). Callers search lower-cased
+# text: one str.lower() per line is far cheaper than re.IGNORECASE, which
+# defeats the regex engine's literal-prefix search.
+_RE_BULL = re.compile(r"bullish|positive|support|strength")
+_RE_BEAR = re.compile(r"bearish|negative|resistance|weakness")
+_RE_NEUT = re.compile(r"neutral|consolidat")
+_RE_WARN = re.compile(r"warning|caution|alert")
+_RE_NOTE = re.compile(r"note|info|tip")
+_RE_IMPORTANT = re.compile(r"important|key")
+
+
+# Annotations for unstyled text. Shared by reference between rich text
+# objects: the blocks are only ever serialized to JSON, so nothing may mutate it.
+_DEFAULT_ANNOTATIONS = {
+    "bold": False,
+    "italic": False,
+    "strikethrough": False,
+    "underline": False,
+    "code": False,
+    "color": "default",
+}
+
 
 def rich_text(
     content: str, bold: bool = False, italic: bool = False, code: bool = False, color: str = "default", link: str = None
 ) -> Dict:
     """Create a rich text object."""
-    text_obj = {
+    text = {"content": content, "link": {"url": link} if link else None}
+
+    if not (bold or italic or code) and color == "default":
+        return {"type": "text", "text": text, "annotations": _DEFAULT_ANNOTATIONS}
+
+    return {
         "type": "text",
-        "text": {"content": content, "link": {"url": link} if link else None},
+        "text": text,
         "annotations": {
             "bold": bold,
             "italic": italic,
@@ -134,27 +199,100 @@ def rich_text(
             "color": color,
         },
     }
-    return text_obj
+
+
+def _find_closing(text: str, delim: str, start: int) -> int:
+    """Return the index of the closing ``delim`` for a span whose content starts at ``start``.
+
+    Mirrors the lazy ``(.+?)`` of the original regex: the content must be at
+    least one character long and may not cross a newline. Returns -1 when the
+    span is not closed.
+    """
+    end = text.find(delim, start + 1)
+    if end == -1 or text.find("\n", start, end) != -1:
+        return -1
+    return end
+
+
+def _tokenize_inline(text: str):
+    """Yield ``(kind, content)`` tokens for markdown inline formatting.
+
+    Kinds are ``"text"``, ``"b_i"`` (bold italic), ``"b"``, ``"i"`` and ``"code"``.
+    Plain runs are located with ``str.find`` so each run is emitted as a single
+    token. Delimiters that are never closed are dropped, as before.
+    """
+    i = 0
+    n = len(text)
+    # Next known delimiter positions; only re-searched once the cursor passes
+    # them, so each delimiter kind is scanned for at most once per occurrence.
+    star = text.find("*")
+    tick = text.find("`")
+    while i < n:
+        if 0 <= star < i:
+            star = text.find("*", i)
+        if 0 <= tick < i:
+            tick = text.find("`", i)
+        if star == -1:
+            nxt = tick
+        elif tick == -1:
+            nxt = star
+        else:
+            nxt = min(star, tick)
+        if nxt == -1:
+            yield ("text", text[i:])
+            return
+        if nxt > i:
+            yield ("text", text[i:nxt])
+        i = nxt
+
+        if text[i] == "`":
+            end = _find_closing(text, "`", i + 1)
+            if end != -1:
+                yield ("code", text[i + 1 : end])
+                i = end + 1
+                continue
+        else:
+            if text.startswith("***", i):
+                end = _find_closing(text, "***", i + 3)
+                if end != -1:
+                    yield ("b_i", text[i + 3 : end])
+                    i = end + 3
+                    continue
+            if text.startswith("**", i):
+                end = _find_closing(text, "**", i + 2)
+                if end != -1:
+                    yield ("b", text[i + 2 : end])
+                    i = end + 2
+                    continue
+            end = _find_closing(text, "*", i + 1)
+            if end != -1:
+                yield ("i", text[i + 1 : end])
+                i = end + 1
+                continue
+
+        # Unmatched delimiter: skip it
+        i += 1
 
 
 def parse_inline_formatting(text: str, default_color: str = "default") -> List[Dict]:
     """Parse markdown inline formatting to rich text objects."""
+    # Most headings, list items and paragraphs carry no inline markup
+    if "*" not in text and "`" not in text:
+        return [rich_text(text, color=default_color)]
+
     result = []
 
-    # Pattern for **bold**, *italic*, `code`, and combinations
-    pattern = r"(\*\*\*(.+?)\*\*\*|\*\*(.+?)\*\*|\*(.+?)\*|`(.+?)`|([^*`]+))"
-
-    for match in re.finditer(pattern, text):
-        if match.group(2):  # ***bold italic***
-            result.append(rich_text(match.group(2), bold=True, italic=True, color=default_color))
-        elif match.group(3):  # **bold**
-            result.append(rich_text(match.group(3), bold=True, color=default_color))
-        elif match.group(4):  # *italic*
-            result.append(rich_text(match.group(4), italic=True, color=default_color))
-        elif match.group(5):  # `code`
-            result.append(rich_text(match.group(5), code=True))
-        elif match.group(6):  # plain text
-            result.append(rich_text(match.group(6), color=default_color))
+    for kind, content in _tokenize_inline(text):
+        if kind == "text":
+            result.append(rich_text(content, color=default_color))
+        elif kind == "b":
+            result.append(rich_text(content, bold=True, color=default_color))
+        elif kind == "i":
+            result.append(rich_text(content, italic=True, color=default_color))
+        elif kind == "code":
+            result.append(rich_text(content, code=True))
+        else:  # ***bold italic***
+            result.append(rich_text(content, bold=True, italic=True, color=default_color))
 
     if not result:
         result.append(rich_text(text, color=default_color))
@@ -162,53 +300,92 @@ def parse_inline_formatting(text: str, default_color: str = "default") -> List[D
     return result
 
 
+# Shared "object"/"type" skeletons; block helpers copy one and add the payload,
+# which is cheaper than building the full literal each time.
+_BLOCK_SHELLS = {
+    block_type: {"object": "block", "type": block_type}
+    for block_type in (
+        "heading_1",
+        "heading_2",
+        "heading_3",
+        "paragraph",
+        "callout",
+        "toggle",
+        "bulleted_list_item",
+        "numbered_list_item",
+        "quote",
+        "code",
+        "divider",
+        "table_of_contents",
+        "table_row",
+    )
+}
+
+
 def heading_block(level: int, text: str, color: str = "default", toggleable: bool = False) -> Dict:
     """Create a heading block."""
     block_type = f"heading_{level}"
-    return {
-        "object": "block",
-        "type": block_type,
-        block_type: {"rich_text": parse_inline_formatting(text), "color": color, "is_toggleable": toggleable},
-    }
+    shell = _BLOCK_SHELLS.get(block_type)
+    block = shell.copy() if shell else {"object": "block", "type": block_type}
+    block[block_type] = {"rich_text": parse_inline_formatting(text), "color": color, "is_toggleable": toggleable}
+    return block
 
 
 def paragraph_block(text: str, color: str = "default") -> Dict:
     """Create a paragraph block."""
-    return {
-        "object": "block",
-        "type": "paragraph",
-        "paragraph": {"rich_text": parse_inline_formatting(text, color), "color": color},
-    }
+    block = _BLOCK_SHELLS["paragraph"].copy()
+    block["paragraph"] = {"rich_text": parse_inline_formatting(text, color), "color": color}
+    return block
 
 
-def callout_block(text: str, emoji: str = "💡", color: str = "default", children: List[Dict] = None) -> Dict:
-    """Create a callout block with icon."""
-    block = {
-        "object": "block",
-        "type": "callout",
-        "callout": {"rich_text": parse_inline_formatting(text), "icon": {"emoji": emoji}, "color": color},
-    }
+def _bold_plus_plain(bold_text: str, plain_text: str, color: str = "default") -> List[Dict]:
+    """Rich text for ``**bold_text**plain_text`` built without running the tokenizer.
+
+    Falls back to :func:`parse_inline_formatting` when either part contains
+    markdown delimiters, so the result always matches the parsed string.
+    """
+    if (
+        not bold_text
+        or "\n" in bold_text
+        or "*" in bold_text
+        or "`" in bold_text
+        or "*" in plain_text
+        or "`" in plain_text
+    ):
+        return parse_inline_formatting(f"**{bold_text}**{plain_text}", color)
+    result = [rich_text(bold_text, bold=True, color=color)]
+    if plain_text:
+        result.append(rich_text(plain_text, color=color))
+    return result
+
+
+def callout_block_from_rt(
+    rt: List[Dict], emoji: str = "💡", color: str = "default", children: List[Dict] = None
+) -> Dict:
+    """Create a callout block from an already built rich text list."""
+    block = _BLOCK_SHELLS["callout"].copy()
+    block["callout"] = {"rich_text": rt, "icon": {"emoji": emoji}, "color": color}
     if children:
         block["callout"]["children"] = children
     return block
 
 
+def callout_block(text: str, emoji: str = "💡", color: str = "default", children: List[Dict] = None) -> Dict:
+    """Create a callout block with icon."""
+    return callout_block_from_rt(parse_inline_formatting(text), emoji=emoji, color=color, children=children)
+
+
 def toggle_block(title: str, children: List[Dict], color: str = "default") -> Dict:
     """Create a toggle block with children."""
-    return {
-        "object": "block",
-        "type": "toggle",
-        "toggle": {"rich_text": parse_inline_formatting(title), "color": color, "children": children},
-    }
+    block = _BLOCK_SHELLS["toggle"].copy()
+    block["toggle"] = {"rich_text": parse_inline_formatting(title), "color": color, "children": children}
+    return block
 
 
 def bulleted_list_item(text: str, color: str = "default", children: List[Dict] = None) -> Dict:
     """Create a bulleted list item."""
-    block = {
-        "object": "block",
-        "type": "bulleted_list_item",
-        "bulleted_list_item": {"rich_text": parse_inline_formatting(text, color), "color": color},
-    }
+    block = _BLOCK_SHELLS["bulleted_list_item"].copy()
+    block["bulleted_list_item"] = {"rich_text": parse_inline_formatting(text, color), "color": color}
     if children:
         block["bulleted_list_item"]["children"] = children
     return block
@@ -216,31 +393,37 @@ def bulleted_list_item(text: str, color: str = "default", children: List[Dict] =
 
 def numbered_list_item(text: str, color: str = "default") -> Dict:
     """Create a numbered list item."""
-    return {
-        "object": "block",
-        "type": "numbered_list_item",
-        "numbered_list_item": {"rich_text": parse_inline_formatting(text, color), "color": color},
-    }
+    block = _BLOCK_SHELLS["numbered_list_item"].copy()
+    block["numbered_list_item"] = {"rich_text": parse_inline_formatting(text, color), "color": color}
+    return block
 
 
 def quote_block(text: str, color: str = "default") -> Dict:
     """Create a quote block."""
-    return {"object": "block", "type": "quote", "quote": {"rich_text": parse_inline_formatting(text), "color": color}}
+    block = _BLOCK_SHELLS["quote"].copy()
+    block["quote"] = {"rich_text": parse_inline_formatting(text), "color": color}
+    return block
 
 
 def code_block(code: str, language: str = "plain text") -> Dict:
     """Create a code block."""
-    return {"object": "block", "type": "code", "code": {"rich_text": [rich_text(code)], "language": language.lower()}}
+    block = _BLOCK_SHELLS["code"].copy()
+    block["code"] = {"rich_text": [rich_text(code)], "language": language.lower()}
+    return block
 
 
 def divider_block() -> Dict:
     """Create a divider block."""
-    return {"object": "block", "type": "divider", "divider": {}}
+    block = _BLOCK_SHELLS["divider"].copy()
+    block["divider"] = {}
+    return block
 
 
 def table_of_contents_block(color: str = "default") -> Dict:
     """Create a table of contents block."""
-    return {"object": "block", "type": "table_of_contents", "table_of_contents": {"color": color}}
+    block = _BLOCK_SHELLS["table_of_contents"].copy()
+    block["table_of_contents"] = {"color": color}
+    return block
 
 
 def image_block(url: str, caption: str = None) -> Dict:
@@ -260,28 +443,38 @@ def bookmark_block(url: str, caption: str = None) -> Dict:
 
 
 def table_block(rows: List[List[str]], has_header: bool = True) -> List[Dict]:
-    """Create a table with rows."""
+    """Create a table with rows.
+
+    Cells are intentionally rendered verbatim via :func:`rich_text`; they do
+    not go through inline markdown parsing.
+    """
     if not rows:
         return []
 
     # Determine table width as the maximum number of cells in any row
     table_width = max((len(r) for r in rows), default=0)
 
+    pad = [""] * table_width
+    row_shell = _BLOCK_SHELLS["table_row"]
+
+    def _row_block(row) -> Dict:
+        # Normalize each row to the table_width by padding empty cells or truncating
+        norm = (list(row) + pad)[:table_width]
+        block = row_shell.copy()
+        block["table_row"] = {"cells": [[rich_text(c if type(c) is str else str(c))] for c in norm]}
+        return block
+
     table = {
         "object": "block",
         "type": "table",
-        "table": {"table_width": table_width, "has_column_header": has_header, "has_row_header": False, "children": []},
+        "table": {
+            "table_width": table_width,
+            "has_column_header": has_header,
+            "has_row_header": False,
+            "children": [_row_block(row) for row in rows],
+        },
     }
 
-    for row in rows:
-        # Normalize each row to the table_width by padding empty cells or truncating
-        norm = list(row)[:table_width] + [""] * max(0, table_width - len(row))
-        cells = []
-        for cell in norm:
-            cells.append([rich_text(str(cell))])
-
-        table["table"]["children"].append({"object": "block", "type": "table_row", "table_row": {"cells": cells}})
-
     return [table]
 
 
@@ -299,17 +492,19 @@ def column_list_block(columns: List[List[Dict]]) -> Dict:
     return {"object": "block", "type": "column_list", "column_list": {"children": column_blocks}}
 
 
+@lru_cache(maxsize=512)
 def get_section_emoji(header_text: str) -> str:
     """Get appropriate emoji for a section header."""
     text_lower = header_text.lower()
 
-    for keyword, emoji in SECTION_EMOJIS.items():
+    for keyword, emoji in _SECTION_EMOJI_ITEMS:
         if keyword in text_lower:
             return emoji
 
     return SECTION_EMOJIS["default"]
 
 
+@lru_cache(maxsize=512)
 def detect_bias_in_text(text: str) -> Optional[str]:
     """Detect bias keywords in text."""
     text_upper = text.upper()
@@ -325,16 +520,20 @@ def detect_bias_in_text(text: str) -> Optional[str]:
 def color_for_bias(bias: str, background: bool = False) -> str:
     """Get color for a bias."""
     if background:
-        return BIAS_BG_COLORS.get(bias, BlockColor.DEFAULT).value
-    return BIAS_COLORS.get(bias, BlockColor.DEFAULT).value
+        return _BIAS_BG_COLOR_VALUES.get(bias, _DEFAULT_COLOR)
+    return _BIAS_COLOR_VALUES.get(bias, _DEFAULT_COLOR)
 
 
 def parse_markdown_table(lines: List[str], start_idx: int) -> Tuple[List[List[str]], int]:
-    """Parse a markdown table starting at the given index."""
+    """Parse a markdown table starting at the given index.
+
+    Lines may be passed pre-stripped; stripping an already stripped line is free.
+    """
     rows = []
     i = start_idx
+    n = len(lines)
 
-    while i < len(lines):
+    while i < n:
         line = lines[i].strip()
 
         # Check if it's a table row
@@ -342,7 +541,7 @@ def parse_markdown_table(lines: List[str], start_idx: int) -> Tuple[List[List[st
             break
 
         # Skip separator rows (|---|---|)
-        if re.match(r"^\|[\s\-:]+\|$", line.replace("|", "|").replace("-", "-")):
+        if len(line) > 2 and line[-1] == "|" and set(line) <= _TABLE_SEP_CHARS:
             i += 1
             continue
 
@@ -356,25 +555,30 @@ def parse_markdown_table(lines: List[str], start_idx: int) -> Tuple[List[List[st
     return rows, i
 
 
+def _strip_html_match(match: re.Match) -> str:
+    token = match.group(0)
+    if token[0] == "<":
+        return ""
+    return _html.unescape(token)
+
+
 def _strip_html_tags(text: str) -> str:
-    """Remove HTML tags and unescape HTML entities."""
+    """Remove HTML tags and unescape HTML entities in a single pass."""
     if not text:
         return ""
-    cleaned = re.sub(r"<[^>]+>", "", text)
-    return _html.unescape(cleaned).strip()
+    return _RE_HTML_TAG_OR_ENTITY.sub(_strip_html_match, text).strip()
 
 
 def convert_html_table_to_markdown(table_html: str) -> str:
     """Convert a single HTML table block into a markdown table (code fenced)."""
     # Extract header cells
-    headers = re.findall(r"<th[^>]*>(.*?)</th>", table_html, flags=re.S | re.I)
+    headers = _RE_TH.findall(table_html)
 
-    # Extract all rows
-    rows_html = re.findall(r"<tr[^>]*>(.*?)</tr>", table_html, flags=re.S | re.I)
+    # Extract all rows, scanning cells in place rather than copying each row out
     rows = []
-    for tr in rows_html:
+    for tr in _RE_TR.finditer(table_html):
         # extract both td and th cells
-        cells = re.findall(r"<t[dh][^>]*>(.*?)</t[dh]>", tr, flags=re.S | re.I)
+        cells = _RE_TD.findall(table_html, tr.start(1), tr.end(1))
         if cells:
             rows.append([_strip_html_tags(c) for c in cells])
 
@@ -409,18 +613,18 @@ def convert_html_table_to_markdown(table_html: str) -> str:
     return "\n" + md + "\n"
 
 
-def convert_all_html_tables_to_markdown(content: str) -> str:
-    """Find all <table>...</table> blocks and replace them with markdown tables."""
-    table_pattern = re.compile(r"<table[^>]*>.*?</table>", flags=re.S | re.I)
+def _html_table_repl(match: re.Match) -> str:
+    try:
+        return convert_html_table_to_markdown(match.group(0))
+    except Exception:
+        return ""
 
-    def _repl(match):
-        table_html = match.group(0)
-        try:
-            return convert_html_table_to_markdown(table_html)
-        except Exception:
-            return ""
 
-    return table_pattern.sub(_repl, content)
+def convert_all_html_tables_to_markdown(content: str) -> str:
+    """Find all <table>...</table> blocks and replace them with markdown tables."""
+    if "<" not in content:
+        return content
+    return _RE_TABLE.sub(_html_table_repl, content)
 
 
 class NotionFormatter:
@@ -432,8 +636,15 @@ class NotionFormatter:
 
     def format_document(self, content: str, doc_type: str = "journal") -> List[Dict]:
         """Format a full document into Notion blocks."""
-        self.blocks = []
+        self.blocks = list(self.iter_document(content, doc_type))
+        return self.blocks
 
+    def iter_document(self, content: str, doc_type: str = "journal") -> Iterator[Dict]:
+        """Yield the Notion blocks for a document one at a time.
+
+        Streaming counterpart of :meth:`format_document` for callers that
+        upload in batches and don't need the whole block list in memory.
+        """
         # Remove frontmatter
         if content.strip().startswith("---"):
             parts = content.split("---", 2)
@@ -441,7 +652,7 @@ class NotionFormatter:
                 # Extract bias from frontmatter if present
                 frontmatter = parts[1]
                 if "bias:" in frontmatter.lower():
-                    match = re.search(r"bias:\s*(\w+)", frontmatter, re.IGNORECASE)
+                    match = _RE_BIAS_FM.search(frontmatter)
                     if match:
                         self.bias = match.group(1).upper()
                 content = parts[2].strip()
@@ -450,21 +661,20 @@ class NotionFormatter:
         content = convert_all_html_tables_to_markdown(content)
 
         # Add header callout based on doc type
-        self._add_header_callout(doc_type)
-
-        # Add table of contents for longer documents
-        if content.count("\n") > 30:
-            self.blocks.append(table_of_contents_block())
-            self.blocks.append(divider_block())
+        yield self._header_callout(doc_type)
 
-        # Process content
         lines = content.split("\n")
-        self._process_lines(lines)
 
-        return self.blocks
+        # Add table of contents for longer documents (more than 30 newlines)
+        if len(lines) > 31:
+            yield table_of_contents_block()
+            yield divider_block()
 
-    def _add_header_callout(self, doc_type: str):
-        """Add a styled header callout based on document type."""
+        # Process content
+        yield from self._iter_blocks(lines)
+
+    def _header_callout(self, doc_type: str) -> Dict:
+        """Build a styled header callout based on document type."""
         # Comprehensive emoji mapping for all document types
         emoji_map = {
             "journal": "📓",
@@ -514,31 +724,55 @@ class NotionFormatter:
         # Add bias indicator if present
         if self.bias:
             bias_emoji = {"BULLISH": "🟢", "BEARISH": "🔴", "NEUTRAL": "🟡"}.get(self.bias, "⚪")
-            header_text = f"**{display_type}** | Bias: {bias_emoji} {self.bias}"
+            header_rt = _bold_plus_plain(display_type, f" | Bias: {bias_emoji} {self.bias}")
         else:
-            header_text = f"**{display_type}**"
+            header_rt = _bold_plus_plain(display_type, "")
 
-        self.blocks.append(callout_block(header_text, emoji=emoji, color=color))
+        return callout_block_from_rt(header_rt, emoji=emoji, color=color)
 
-    def _process_lines(self, lines: List[str]):
-        """Process markdown lines into blocks."""
+    def _iter_blocks(self, lines: List[str]) -> Iterator[Dict]:
+        """Yield blocks for markdown lines."""
         i = 0
+        n = len(lines)
         _current_section = []  # Reserved for future section grouping
 
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
+        # Strip every line once; raw lines are only needed inside code blocks
+        stripped_lines = [line.strip() for line in lines]
+
+        # Consecutive plain lines with the same color are emitted as one
+        # paragraph block (joined with newlines) to cut the block count.
+        pending: List[str] = []
+        pending_color = "default"
+        pending_len = 0
 
-            # Skip empty lines between sections
+        def flush_paragraph() -> Dict:
+            nonlocal pending_len
+            block = paragraph_block("\n".join(pending), color=pending_color)
+            pending.clear()
+            pending_len = 0
+            return block
+
+        while i < n:
+            stripped = stripped_lines[i]
+
+            # Skip empty lines between sections (they also end a paragraph)
             if not stripped:
+                if pending:
+                    yield flush_paragraph()
                 i += 1
                 continue
 
+            # Classify the line with a single regex run; None means paragraph
+            m = _RE_LINE_KIND.match(stripped)
+            kind = m.lastgroup if m else None
+
+            if pending and kind is not None:
+                yield flush_paragraph()
+
             # Headers
-            header_match = re.match(r"^(#{1,3})\s+(.+)$", stripped)
-            if header_match:
-                level = len(header_match.group(1))
-                text = header_match.group(2)
+            if kind == "header":
+                level = len(m.group("hlevel"))
+                text = m.group("htext")
 
                 # Style headers based on content
                 color = "default"
@@ -551,93 +785,94 @@ class NotionFormatter:
                     emoji = get_section_emoji(text)
                     text = f"{emoji} {text}"
 
-                self.blocks.append(heading_block(level, text, color=color))
+                yield heading_block(level, text, color=color)
                 i += 1
-                continue
 
             # Horizontal rule / divider
-            if re.match(r"^---+$", stripped) or re.match(r"^\*\*\*+$", stripped):
-                self.blocks.append(divider_block())
+            elif kind == "hr":
+                yield divider_block()
                 i += 1
-                continue
 
             # Code blocks
-            if stripped.startswith("```"):
+            elif kind == "fence":
                 language = stripped[3:].strip() or "plain text"
                 code_lines = []
                 i += 1
 
-                while i < len(lines) and not lines[i].strip().startswith("```"):
+                while i < n and not stripped_lines[i].startswith("```"):
                     code_lines.append(lines[i])
                     i += 1
                 i += 1  # Skip closing ```
 
-                self.blocks.append(code_block("\n".join(code_lines), language))
-                continue
+                yield code_block("\n".join(code_lines), language)
 
             # Tables
-            if stripped.startswith("|"):
-                rows, i = parse_markdown_table(lines, i)
+            elif kind == "table":
+                rows, i = parse_markdown_table(stripped_lines, i)
                 if rows:
-                    self.blocks.extend(table_block(rows))
-                continue
+                    yield from table_block(rows)
 
             # Blockquotes - convert to callouts
-            if stripped.startswith(">"):
-                quote_text = re.sub(r"^>\s*", "", stripped)
+            elif kind == "quote":
+                quote_text = stripped[1:].lstrip()
 
                 # Detect if it's a special callout
-                if any(word in quote_text.lower() for word in ["warning", "caution", "alert"]):
-                    self.blocks.append(callout_block(quote_text, emoji="⚠️", color="yellow_background"))
-                elif any(word in quote_text.lower() for word in ["note", "info", "tip"]):
-                    self.blocks.append(callout_block(quote_text, emoji="💡", color="blue_background"))
-                elif any(word in quote_text.lower() for word in ["important", "key"]):
-                    self.blocks.append(callout_block(quote_text, emoji="🔑", color="orange_background"))
+                quote_lower = quote_text.lower()
+                if _RE_WARN.search(quote_lower):
+                    yield callout_block(quote_text, emoji="⚠️", color="yellow_background")
+                elif _RE_NOTE.search(quote_lower):
+                    yield callout_block(quote_text, emoji="💡", color="blue_background")
+                elif _RE_IMPORTANT.search(quote_lower):
+                    yield callout_block(quote_text, emoji="🔑", color="orange_background")
                 else:
-                    self.blocks.append(quote_block(quote_text))
+                    yield quote_block(quote_text)
 
                 i += 1
-                continue
 
             # Bullet lists with special handling
-            bullet_match = re.match(r"^[-*]\s+(.+)$", stripped)
-            if bullet_match:
-                text = bullet_match.group(1)
+            elif kind == "bullet":
+                text = m.group("btext")
                 color = "default"
 
                 # Color based on content
-                if any(word in text.lower() for word in ["bullish", "positive", "support", "strength"]):
+                text_lower = text.lower()
+                if _RE_BULL.search(text_lower):
                     color = "green"
-                elif any(word in text.lower() for word in ["bearish", "negative", "resistance", "weakness"]):
+                elif _RE_BEAR.search(text_lower):
                     color = "red"
-                elif any(word in text.lower() for word in ["neutral", "consolidat"]):
+                elif _RE_NEUT.search(text_lower):
                     color = "yellow"
 
-                self.blocks.append(bulleted_list_item(text, color=color))
+                yield bulleted_list_item(text, color=color)
                 i += 1
-                continue
 
             # Numbered lists
-            num_match = re.match(r"^\d+\.\s+(.+)$", stripped)
-            if num_match:
-                self.blocks.append(numbered_list_item(num_match.group(1)))
+            elif kind == "num":
+                yield numbered_list_item(m.group("ntext"))
                 i += 1
-                continue
 
             # Regular paragraphs - detect and color special content
-            color = "default"
-            bias = detect_bias_in_text(stripped)
-            if bias:
-                color = color_for_bias(bias)
-
-            # Highlight key metrics
-            if re.search(r"\b(RSI|ADX|ATR|SMA|EMA|MACD)\b", stripped):
-                color = "blue"
-            elif re.search(r"\$[\d,]+", stripped):  # Price mentions
-                color = "green"
-
-            self.blocks.append(paragraph_block(stripped, color=color))
-            i += 1
+            else:
+                color = "default"
+                bias = detect_bias_in_text(stripped)
+                if bias:
+                    color = color_for_bias(bias)
+
+                # Highlight key metrics
+                if _RE_INDICATOR.search(stripped):
+                    color = "blue"
+                elif _RE_PRICE.search(stripped):  # Price mentions
+                    color = "green"
+
+                if pending and (color != pending_color or pending_len + len(stripped) > _MAX_PARAGRAPH_CHARS):
+                    yield flush_paragraph()
+                pending.append(stripped)
+                pending_color = color
+                pending_len += len(stripped) + 1
+                i += 1
+
+        if pending:
+            yield flush_paragraph()
 
     def create_summary_callout(self, summary_text: str) -> Dict:
         """Create a prominent summary callout."""
@@ -649,7 +884,7 @@ class NotionFormatter:
             else "yellow_background"
         )
 
-        return callout_block(f"**Summary:** {summary_text}", emoji="📋", color=color)
+        return callout_block_from_rt(_bold_plus_plain("Summary:", f" {summary_text}"), emoji="📋", color=color)
 
     def create_metrics_columns(self, metrics: Dict[str, str]) -> Optional[Dict]:
         """Create a two-column layout for metrics."""
@@ -659,9 +894,15 @@ class NotionFormatter:
         items = list(metrics.items())
         mid = len(items) // 2
 
-        left_col = [callout_block(f"**{k}:** {v}", emoji="📊", color="gray_background") for k, v in items[:mid]]
+        left_col = [
+            callout_block_from_rt(_bold_plus_plain(f"{k}:", f" {v}"), emoji="📊", color="gray_background")
+            for k, v in items[:mid]
+        ]
 
-        right_col = [callout_block(f"**{k}:** {v}", emoji="📊", color="gray_background") for k, v in items[mid:]]
+        right_col = [
+            callout_block_from_rt(_bold_plus_plain(f"{k}:", f" {v}"), emoji="📊", color="gray_background")
+            for k, v in items[mid:]
+        ]
 
         return column_list_block([left_col, right_col])
 
@@ -17,28 +17,31 @@ Python-based publisher that syncs reports to Notion database.
 Includes intelligent deduplication to prevent publishing the same content multiple times.
 """
 
+import importlib.util
 import logging
 import os
 import random
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 # Add parent to path for imports
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-try:
-    from notion_client import Client
-
-    NOTION_AVAILABLE = True
-except ImportError:
-    NOTION_AVAILABLE = False
-    # Provide a placeholder Client attribute so tests can monkeypatch this module
-    Client = None
+# notion_client (and the httpx stack under it) is only imported when a
+# NotionPublisher actually needs a client; see _notion_client_class. The
+# module-level Client stays a placeholder that tests can monkeypatch.
+NOTION_AVAILABLE = importlib.util.find_spec("notion_client") is not None
+Client = None
+if not NOTION_AVAILABLE:
     print("notion-client not installed. Run: pip install notion-client")
 
 try:
@@ -58,7 +61,26 @@ _DISABLE_NOTION_PUBLISH = str(os.getenv("DISABLE_NOTION_PUBLISH", "0")).lower()
 import hashlib
 import html
 
-from filelock import FileLock
+from filelock import FileLock, SoftFileLock
+
+try:
+    import yaml
+
+    # libyaml-backed loader when PyYAML was built with it
+    class _FrontmatterLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+        """Safe loader that types frontmatter like the line parser does.
+
+        Plain scalars stay strings (so "1.50", "yes" and dates keep their
+        spelling) except true/false in any case, which become bools.
+        """
+
+        yaml_implicit_resolvers = {}
+
+    _FrontmatterLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:bool", re.compile(r"^(?:[Tt][Rr][Uu][Ee]|[Ff][Aa][Ll][Ss][Ee])$"), list("tTfF")
+    )
+except ImportError:
+    yaml = None
 
 # Import database manager for sync tracking
 try:
@@ -96,6 +118,15 @@ IGNORE_PATTERNS = [
     "FILE_INDEX",
 ]
 
+_IGNORE_PATTERNS_LOWER = tuple(p.lower() for p in IGNORE_PATTERNS)
+
+
+def _is_ignored_path(path: Path) -> bool:
+    """True when any IGNORE_PATTERNS entry occurs in the path (the file name is part of it)."""
+    path_lower = str(path).lower()
+    return any(p in path_lower for p in _IGNORE_PATTERNS_LOWER)
+
+
 # File pattern to Notion type mapping - ORDER MATTERS (first match wins)
 TYPE_PATTERNS = [
     # Journals (daily)
@@ -207,6 +238,407 @@ KEYWORD_PATTERNS = [
     r"\b(geopolitical|sanctions|tariffs)\b",
 ]
 
+# Compiled once at import; call sites below reuse these instead of handing
+# pattern strings (and flags) to the re module on every call.
+#
+# TYPE_PATTERNS are fused into one regex. Each pattern sits in a lookahead
+# anchored at the start of the name, so alternatives are tried in list order
+# (first match wins, as before) rather than by leftmost match position, and
+# ``match.lastgroup`` ("g<index>") names the winner. ``^``-anchored patterns
+# (most of them) skip the ``.*?`` scan entirely.
+_RE_TYPE = re.compile(
+    "|".join(
+        f"(?P<g{i}>(?={p[1:]}))" if p.startswith("^") else f"(?P<g{i}>(?=.*?(?:{p})))"
+        for i, (p, _) in enumerate(TYPE_PATTERNS)
+    ),
+    re.IGNORECASE | re.DOTALL,
+)
+_TYPE_BY_GROUP = {f"g{i}": doc_type for i, (_, doc_type) in enumerate(TYPE_PATTERNS)}
+
+# All ticker and keyword patterns fused into a single scan (the [3:-3] slice
+# drops each pattern's \b( ... )\b wrapper). Every token is bounded by \b, so
+# no two patterns can claim overlapping text and one findall pass finds
+# exactly what a findall per pattern did. The alternatives are upper-cased and
+# matched case-sensitively against content.upper(), which is several times
+# faster than IGNORECASE. Every alternative is a literal, so each matched
+# token maps straight to its tag through _TAG_FOR_TOKEN (built below).
+_TICKER_TOKENS = [t.upper() for p in TICKER_PATTERNS for t in p[3:-3].split("|")]
+_KEYWORD_TOKENS = [t.upper() for p in KEYWORD_PATTERNS for t in p[3:-3].split("|")]
+
+
+def _first_char_alternation(tokens: List[str]) -> str:
+    """Join literal tokens into an alternation grouped by first character.
+
+    ``GOLD|GDX|SPY`` becomes ``G(?:OLD|DX)|S(?:PY)``, so at each position the
+    engine tests one branch per distinct first character instead of every
+    token. Tokens keep their relative order, so the same alternative wins.
+    """
+    by_first: Dict[str, List[str]] = {}
+    for token in dict.fromkeys(tokens):
+        by_first.setdefault(token[0], []).append(re.escape(token[1:]))
+    return "|".join(f"{re.escape(first)}(?:{'|'.join(rest)})" for first, rest in by_first.items())
+
+
+_RE_TAGS = re.compile(r"\b(?:" + _first_char_alternation(_TICKER_TOKENS + _KEYWORD_TOKENS) + r")\b")
+_TICKER_ALIASES = {
+    "XAUUSD": "GOLD",
+    "GC=F": "GOLD",
+    "XAGUSD": "SILVER",
+    "SI=F": "SILVER",
+    "SPX": "SPY",
+    "ES=F": "SPY",
+    "BTCUSD": "BTC",
+    "ETHUSD": "ETH",
+}
+
+# Notion accepts at most this many child blocks per create/append request
+_MAX_CHILDREN_PER_REQUEST = 100
+# Notion rejects rich text content longer than this, so coalesced
+# paragraphs are split before reaching it (same limit as notion_formatter).
+_MAX_PARAGRAPH_CHARS = 2000
+
+_RE_FRONTMATTER_OPEN = re.compile(r"\s*---")
+_RE_H1 = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+# Block-level line classifier for markdown_to_blocks. Each alternative is
+# wrapped in an outer named group so ``match.lastgroup`` names the kind.
+_RE_BLOCK_KIND = re.compile(
+    r"(?P<header>(?P<hlevel>#{1,3})\s+(?P<htext>.+)$)"
+    r"|(?P<table>\|)"
+    r"|(?P<fence>```)"
+    r"|(?P<quote>>)"
+    r"|(?P<bullet>[-*]\s+)"
+    r"|(?P<num>\d+\.\s+(?P<ntext>.+)$)"
+    r"|(?P<hr>(?:-{3,}|\*{3,})$)"
+)
+# Fence languages passed through to Notion (names as in its language enum);
+# anything else is sent as "plain text"
+_CODE_LANGUAGES = frozenset(
+    {
+        "bash",
+        "c",
+        "css",
+        "go",
+        "html",
+        "java",
+        "javascript",
+        "json",
+        "markdown",
+        "python",
+        "rust",
+        "sql",
+        "typescript",
+        "yaml",
+    }
+)
+# Every _RE_BLOCK_KIND alternative starts with one of these characters; other
+# lines are paragraphs and skip the regex.
+_BLOCK_LEAD_CHARS = frozenset("#|`>-*0123456789")
+_RE_TABLE_SEP = re.compile(r"^\|[-:\s|]+\|$")
+_RE_QUOTE = re.compile(r"^>\s*")
+_RE_INLINE = re.compile(r"(\*\*[^*]+\*\*|\*[^*]+\*|`[^`]+`)")
+# Coalesced paragraph lines keep their per-line inline spans
+_RE_INLINE_LINE = re.compile(r"(\*\*[^*\n]+\*\*|\*[^*\n]+\*|`[^`\n]+`)")
+_RE_HTML_TAG = re.compile(r"<[^>]+>")
+_RE_WS = re.compile(r"\s+")
+_RE_TAG_JUNK = re.compile(r"[^A-Za-z0-9\-\._ /]")
+_RE_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+# Non-ISO frontmatter dates: Y-m-d / Y/m/d, d-m-Y and m/d/Y with 1-2 digit fields
+# (days may be space-padded, as strptime's %d allows)
+_RE_LOOSE_DATE = re.compile(
+    r"(?P<ymd_y>\d{4})(?P<sep>[-/])(?P<ymd_m>\d{1,2})(?P=sep)(?P<ymd_d>\d{1,2}| \d)"
+    r"|(?P<dmy_d>\d{1,2}| \d)-(?P<dmy_m>\d{1,2})-(?P<dmy_y>\d{4})"
+    r"|(?P<mdy_m>\d{1,2})/(?P<mdy_d>\d{1,2}| \d)/(?P<mdy_y>\d{4})"
+)
+
+
+@lru_cache(maxsize=4096)
+def _detect_type_cached(name: str) -> str:
+    """Map a file name to its Notion type (first TYPE_PATTERNS match wins)."""
+    m = _RE_TYPE.match(name)
+    return _TYPE_BY_GROUP[m.lastgroup] if m else "notes"
+
+
+def _plain_frontmatter_value(value: Any) -> Any:
+    """Map a loaded YAML value back to what the line parser produced.
+
+    _FrontmatterLoader already keeps plain scalars as strings; explicitly tagged
+    values (``!!int 3``) and nulls are stringified here too, and list items
+    are always strings, so the dedup fingerprint sees the same text as before.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, (str, bool, dict)):
+        return value
+    if isinstance(value, list):
+        return [_plain_list_item(item) for item in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _plain_list_item(item: Any) -> str:
+    # The line parser never typed list items: [true, 3] gave ["true", "3"]
+    if isinstance(item, bool):
+        return str(item).lower()
+    return item if isinstance(item, str) else str(_plain_frontmatter_value(item))
+
+
+def _normalize_keyword(match: str) -> str:
+    """Normalize a matched KEYWORD_PATTERNS token for use as a tag."""
+    normalized = match.upper() if len(match) <= 4 else match.title()
+    # Special cases
+    lowered = normalized.lower()
+    if lowered in ("bullish", "bearish", "neutral"):
+        normalized = normalized.title()
+    elif lowered in ("fed", "fomc", "ecb", "boj", "boe", "pboc"):
+        normalized = normalized.upper()
+    elif "federal reserve" in lowered:
+        normalized = "Fed"
+    elif "rate cut" in lowered:
+        normalized = "Rate Cut"
+    elif "rate hike" in lowered:
+        normalized = "Rate Hike"
+    return normalized
+
+
+# Canonical tag for every token _RE_TAGS can match. Tickers take precedence,
+# mirroring their place first in the alternation.
+_TAG_FOR_TOKEN = {t: _normalize_keyword(t) for t in _KEYWORD_TOKENS}
+_TAG_FOR_TOKEN.update((t, _TICKER_ALIASES.get(t, t)) for t in _TICKER_TOKENS)
+
+
+def _notion_client_class():
+    """Return the Notion Client class, importing notion_client on first use."""
+    global Client
+    if Client is None and NOTION_AVAILABLE:
+        from notion_client import Client
+    return Client
+
+
+@lru_cache(maxsize=None)
+def _enhanced_formatting():
+    """Return ``(ChartPublisher, format_for_notion)``, or None if they cannot be imported.
+
+    Resolved once, like _notion_client_class, so a missing formatter is not
+    searched for on sys.path again by every publish.
+    """
+    try:
+        from scripts.chart_publisher import ChartPublisher
+        from scripts.notion_formatter import format_for_notion
+    except ImportError:
+        return None
+    return ChartPublisher, format_for_notion
+
+
+def _env_float(key: str, default: float) -> float:
+    """Get a float environment variable, falling back to ``default`` if it is malformed."""
+    try:
+        return float(os.environ.get(key, str(default)))
+    except ValueError:
+        logging.warning("Ignoring non-numeric %s=%r; using %s", key, os.environ.get(key), default)
+        return default
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing requests to ``rps`` per second.
+
+    Bursts of up to ``rps`` requests go through immediately; after that each
+    caller reserves the next free slot and sleeps until it arrives. A rate of
+    zero or less disables pacing.
+    """
+
+    def __init__(self, rps: float):
+        self.rps = rps
+        self.capacity = max(1.0, rps)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rps <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rps)
+            self.last = now
+            # Reserve a token even if it is not there yet, so waiting callers
+            # queue up behind each other instead of all waking at once
+            self.tokens -= 1
+            wait = -self.tokens / self.rps if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+# Shared by every publisher and sync worker in the process: Notion's limit is
+# per integration (about 3 requests/second on average), not per connection
+_NOTION_BUCKET = TokenBucket(_env_float("NOTION_RPS", 3.0))
+
+
+def _build_http_client():
+    """Create the httpx transport handed to notion_client.Client.
+
+    Keep-alive is sized for the sync_all_outputs thread pool, and HTTP/2 is
+    used when the optional ``h2`` package is installed so concurrent requests
+    share one TLS connection. Requests are paced through _NOTION_BUCKET.
+    """
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        # Pace every notion_client request, including its own internal retries
+        event_hooks={"request": [lambda request: _NOTION_BUCKET.acquire()]},
+    )
+
+
+# Notion answers with these while rate limiting or briefly unavailable
+_TRANSIENT_HTTP_STATUSES = frozenset({409, 429, 500, 502, 503, 504})
+_TRANSIENT_ERROR_CODES = frozenset(
+    {
+        "conflict_error",
+        "rate_limited",
+        "internal_server_error",
+        "service_unavailable",
+        "gateway_timeout",
+        "notionhq_client_request_timeout",
+    }
+)
+
+
+def _is_transient_notion_error(exc: Exception) -> bool:
+    """True for rate limits, conflicts, Notion-side 5xx errors and client timeouts.
+
+    Checks the ``status``/``code`` attributes notion_client errors carry
+    rather than importing its exception classes, which moved between releases.
+    """
+    code = getattr(exc, "code", None)
+    # notion_client's APIErrorCode is a str-valued Enum; compare its value
+    code = getattr(code, "value", code)
+    return getattr(exc, "status", None) in _TRANSIENT_HTTP_STATUSES or code in _TRANSIENT_ERROR_CODES
+
+
+def _is_client_notion_error(exc: Exception) -> bool:
+    """True for 4xx responses that resending the same request cannot fix."""
+    status = getattr(exc, "status", None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in _TRANSIENT_HTTP_STATUSES
+
+
+def _retry_after_seconds(exc: Exception):
+    """Seconds from the Retry-After header of a Notion error response, if present."""
+    headers = getattr(exc, "headers", None)
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _backoff_sleep(delay: float, retry_after: float = None) -> float:
+    """Sleep before the next attempt and return the next, doubled delay.
+
+    Waits ``retry_after`` seconds when the server asked for it, ``delay``
+    otherwise, plus up to 30% of ``delay`` as jitter.
+    """
+    wait = delay if retry_after is None else retry_after
+    sleep_time = wait + random.uniform(0, 0.3 * delay)
+    logging.info("Backing off for %.2fs before retrying", sleep_time)
+    time.sleep(sleep_time)
+    return delay * 2
+
+
+def _parse_rich_text(text: str, pattern: re.Pattern = _RE_INLINE) -> List[Dict]:
+    """Parse inline markdown to rich text annotations."""
+    # Most lines carry no inline markup at all
+    if "*" not in text and "`" not in text:
+        return [{"type": "text", "text": {"content": text}}]
+
+    rich_texts = []
+
+    # Simple approach: split by bold/italic markers
+    # For now, just detect **bold** and *italic*
+    parts = pattern.split(text)
+
+    for i, part in enumerate(parts):
+        if not part:
+            continue
+
+        # split() puts the captured spans at odd indices; the rest is plain text
+        if i % 2 == 0:
+            rich_texts.append({"type": "text", "text": {"content": part}})
+        elif part.startswith("**") and part.endswith("**"):
+            rich_texts.append({"type": "text", "text": {"content": part[2:-2]}, "annotations": {"bold": True}})
+        elif part.startswith("*") and part.endswith("*") and not part.startswith("**"):
+            rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"italic": True}})
+        elif part.startswith("`") and part.endswith("`"):
+            rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"code": True}})
+        else:
+            rich_texts.append({"type": "text", "text": {"content": part}})
+
+    return rich_texts if rich_texts else [{"type": "text", "text": {"content": text}}]
+
+
+def _text_block(block_type: str, rich_text: List[Dict]) -> Dict:
+    """Build a block whose payload is only rich text (paragraph, heading, list item, quote)."""
+    return {"object": "block", "type": block_type, block_type: {"rich_text": rich_text}}
+
+
+def _divider_block() -> Dict:
+    """Build a divider block."""
+    return {"object": "block", "type": "divider", "divider": {}}
+
+
+def _code_block(content: str, language: str = "plain text") -> Dict:
+    """Build a code block holding ``content`` verbatim."""
+    return {
+        "object": "block",
+        "type": "code",
+        "code": {"rich_text": [{"type": "text", "text": {"content": content}}], "language": language},
+    }
+
+
+def _normalize_date(val: str) -> str:
+    """Return ``val`` as a YYYY-MM-DD string, or None if it is not a recognisable date."""
+    if not val:
+        return None
+    # Accept ISO-like strings or common formats; prefer YYYY-MM-DD
+    try:
+        # Fast path: already ISO
+        if isinstance(val, str) and _RE_ISO_DATE.match(val):
+            return val.split("T")[0]
+        try:
+            return datetime.fromisoformat(val).date().isoformat()
+        except Exception:
+            pass
+        m = _RE_LOOSE_DATE.fullmatch(val)
+        if m:
+            kind = next(k for k in ("ymd", "dmy", "mdy") if m[k + "_y"])
+            return date(int(m[kind + "_y"]), int(m[kind + "_m"]), int(m[kind + "_d"])).isoformat()
+    except Exception:
+        pass
+    return None
+
+
+def _map_relation(prop_value) -> List[Dict]:
+    """Map a page id, or a list of ids / ``{"id": ...}`` dicts, to a Notion relation payload."""
+    if not prop_value:
+        return []
+    if isinstance(prop_value, str):
+        return [{"id": prop_value}]
+    if isinstance(prop_value, list):
+        out = []
+        for v in prop_value:
+            if isinstance(v, dict) and v.get("id"):
+                out.append({"id": v["id"]})
+            elif isinstance(v, str):
+                out.append({"id": v})
+        return out
+    return []
+
 
 @dataclass
 class NotionConfig:
@@ -231,14 +663,76 @@ class NotionPublisher:
 
     def __init__(self, config: NotionConfig = None, no_client_ok: bool = False):
         # Allow tests or dry-run to construct without the Notion client.
-        if not no_client_ok and not NOTION_AVAILABLE and Client is None:
+        client_cls = None if no_client_ok else _notion_client_class()
+        if not no_client_ok and client_cls is None:
             raise ImportError("notion-client package not installed")
 
         self.config = config or NotionConfig.from_env()
+        # Serializes schema discovery so concurrent sync workers fetch it once
+        self._schema_lock = threading.Lock()
+        self._schema_cache_ttl = float(os.getenv("NOTION_SCHEMA_CACHE_TTL", "300"))
+        # A data source pinned via env wins over discovery; read it once
+        self._env_data_source_id = os.getenv("NOTION_DATA_SOURCE_ID") or None
         # Initialize the notion client (may be a real client, a monkeypatched fake, or None for dry-run)
-        self.client = Client(auth=self.config.api_key) if (Client is not None and not no_client_ok) else None
+        self.client = None
+        if client_cls is not None:
+            client_kwargs = {}
+            if getattr(client_cls, "__module__", "").startswith("notion_client"):
+                # One pooled transport shared by every sync_all_outputs worker
+                client_kwargs["client"] = _build_http_client()
+            self.client = client_cls(auth=self.config.api_key, **client_kwargs)
+
+    def close(self) -> None:
+        """Release the Notion client's and the raw API session's pooled connections."""
+        for owner in (getattr(self, "client", None), getattr(self, "_session", None)):
+            close = getattr(owner, "close", None)
+            if close is not None:
+                close()
+
+    def _get_session(self):
+        """Get or create the keep-alive session for raw Notion API requests."""
+        session = getattr(self, "_session", None)
+        if session is None:
+            import requests
+
+            session = requests.Session()
+            session.headers.update(
+                {
+                    "Authorization": f"Bearer {self.config.api_key}",
+                    "Notion-Version": "2025-09-03",
+                    "Content-Type": "application/json",
+                }
+            )
+            self._session = session
+        return session
+
+    def _api_get(self, url: str):
+        """GET a raw Notion API URL on the keep-alive session, paced by _NOTION_BUCKET."""
+        _NOTION_BUCKET.acquire()
+        return self._get_session().get(url, timeout=int(os.getenv("NOTION_API_TIMEOUT", "30")))
 
     def _get_database_properties(self) -> Dict[str, Any]:
+        """Return the database schema, reusing a recent successful lookup.
+
+        Discovery costs one or two HTTPS round trips and publish consults the
+        schema more than once per page, so a non-empty result is kept for
+        NOTION_SCHEMA_CACHE_TTL seconds (default 300).
+        """
+        ttl = self._schema_cache_ttl
+        cached = getattr(self, "_db_props_cache", None)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        with self._schema_lock:
+            # Another worker may have refreshed the schema while we waited
+            cached = getattr(self, "_db_props_cache", None)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                return cached[1]
+            props = self._fetch_database_properties()
+            if props:
+                self._db_props_cache = (time.monotonic(), props)
+            return props
+
+    def _fetch_database_properties(self) -> Dict[str, Any]:
         """Return data-source properties if available, otherwise fall back to database properties.
 
         This method attempts to discover a `data_source_id` for the configured
@@ -251,21 +745,12 @@ class NotionPublisher:
         """
         try:
             # If user pinned a data source via env, respect it
-            ds_id = os.getenv("NOTION_DATA_SOURCE_ID") or getattr(self, "_data_source_id", None)
+            ds_id = self._env_data_source_id or getattr(self, "_data_source_id", None)
 
             # Discovery step: fetch data_sources for the database (2025-09-03 behavior)
             if not ds_id:
                 try:
-                    import requests
-
-                    url = f"https://api.notion.com/v1/databases/{self.config.database_id}"
-                    headers = {
-                        "Authorization": f"Bearer {self.config.api_key}",
-                        "Notion-Version": "2025-09-03",
-                        "Content-Type": "application/json",
-                    }
-                    timeout = int(os.getenv("NOTION_API_TIMEOUT", "30"))
-                    r = requests.get(url, headers=headers, timeout=timeout)
+                    r = self._api_get(f"https://api.notion.com/v1/databases/{self.config.database_id}")
                     r.raise_for_status()
                     payload = r.json() or {}
                     data_sources = payload.get("data_sources") or []
@@ -279,16 +764,7 @@ class NotionPublisher:
             # If we have a data source id, fetch its schema (properties)
             if ds_id:
                 try:
-                    import requests
-
-                    url = f"https://api.notion.com/v1/data_sources/{ds_id}"
-                    headers = {
-                        "Authorization": f"Bearer {self.config.api_key}",
-                        "Notion-Version": "2025-09-03",
-                        "Content-Type": "application/json",
-                    }
-                    timeout = int(os.getenv("NOTION_API_TIMEOUT", "30"))
-                    r = requests.get(url, headers=headers, timeout=timeout)
+                    r = self._api_get(f"https://api.notion.com/v1/data_sources/{ds_id}")
                     r.raise_for_status()
                     payload = r.json() or {}
                     props = payload.get("properties", {}) or {}
@@ -305,111 +781,67 @@ class NotionPublisher:
                     db = self.client.databases.retrieve(self.config.database_id)
                 except Exception:
                     # Last resort: try a simple requests call with a larger timeout
-                    timeout = int(os.getenv("NOTION_API_TIMEOUT", "30"))
-                    import requests as _req
-
-                    url = f"https://api.notion.com/v1/databases/{self.config.database_id}"
-                    headers = {
-                        "Authorization": f"Bearer {self.config.api_key}",
-                        "Notion-Version": "2025-09-03",
-                        "Content-Type": "application/json",
-                    }
-                    r = _req.get(url, headers=headers, timeout=timeout)
+                    r = self._api_get(f"https://api.notion.com/v1/databases/{self.config.database_id}")
                     r.raise_for_status()
                     db = r.json() or {}
                 props = db.get("properties", {}) or {}
                 return props
             except Exception as e:
-                print(f"[NotionPublisher] Could not retrieve database properties: {e}")
+                logging.warning("Could not retrieve database properties: %s", e)
                 return {}
         except Exception as e:
-            print(f"[NotionPublisher] Error while getting database/data-source properties: {e}")
+            logging.warning("Error while getting database/data-source properties: %s", e)
             return {}
 
     def detect_type(self, filename: str) -> str:
         """Detect document type from filename."""
-        name = Path(filename).name
-
-        for pattern, doc_type in TYPE_PATTERNS:
-            if re.search(pattern, name, re.IGNORECASE):
-                return doc_type
-
-        return "notes"
+        return _detect_type_cached(Path(filename).name)
 
     def extract_tags(self, content: str) -> List[str]:
         """Extract tags from content."""
-        tags = set()
-
-        for pattern in TICKER_PATTERNS:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                normalized = match.upper()
-                # Normalize variations
-                if normalized in ("XAUUSD", "GC=F"):
-                    normalized = "GOLD"
-                elif normalized in ("XAGUSD", "SI=F"):
-                    normalized = "SILVER"
-                elif normalized in ("SPX", "ES=F"):
-                    normalized = "SPY"
-                elif normalized in ("BTCUSD",):
-                    normalized = "BTC"
-                elif normalized in ("ETHUSD",):
-                    normalized = "ETH"
-                elif normalized in ("Bitcoin",):
-                    normalized = "BTC"
-                elif normalized in ("Ethereum",):
-                    normalized = "ETH"
-                tags.add(normalized)
-
-        # Extract keyword tags from KEYWORD_PATTERNS
-        for pattern in KEYWORD_PATTERNS:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                # Normalize keywords
-                normalized = match.upper() if len(match) <= 4 else match.title()
-                # Special cases
-                if normalized.lower() in ("bullish", "bearish", "neutral"):
-                    normalized = normalized.title()
-                elif normalized.lower() in ("fed", "fomc", "ecb", "boj", "boe", "pboc"):
-                    normalized = normalized.upper()
-                elif "federal reserve" in normalized.lower():
-                    normalized = "Fed"
-                elif "rate cut" in normalized.lower():
-                    normalized = "Rate Cut"
-                elif "rate hike" in normalized.lower():
-                    normalized = "Rate Hike"
-                tags.add(normalized)
-
-        return sorted(list(tags))[:15]  # Allow more tags for comprehensive coverage
+        tags = {_TAG_FOR_TOKEN[token] for token in _RE_TAGS.findall(content.upper())}
+
+        return sorted(tags)[:15]  # Allow more tags for comprehensive coverage
 
     def parse_frontmatter(self, content: str) -> tuple[Dict[str, Any], str]:
         """Parse YAML frontmatter from content."""
-        if not content.strip().startswith("---"):
+        # Locate the two fences directly instead of strip()/split() copying the
+        # whole document; the slices match what content.split("---", 2) gave.
+        opening = _RE_FRONTMATTER_OPEN.match(content)
+        if not opening:
             return {}, content
 
-        parts = content.split("---", 2)
-        if len(parts) < 3:
+        closing = content.find("---", opening.end())
+        if closing < 0:
             return {}, content
 
-        yaml_str = parts[1].strip()
-        body = parts[2].strip()
+        yaml_str = content[opening.end() : closing].strip()
+        body = content[closing + 3 :].strip()
 
-        # Simple YAML parsing
+        if yaml is not None:
+            try:
+                loaded = yaml.load(yaml_str, Loader=_FrontmatterLoader) or {}
+            except yaml.YAMLError:
+                # e.g. unquoted "title: Gold: Weekly" - use the line parser below
+                loaded = None
+            if isinstance(loaded, dict):
+                return {str(k): _plain_frontmatter_value(v) for k, v in loaded.items()}, body
+
+        # Simple YAML parsing (PyYAML unavailable or frontmatter not valid YAML)
         meta = {}
         for line in yaml_str.split("\n"):
             if ":" in line:
                 key, value = line.split(":", 1)
                 key = key.strip()
                 value = value.strip()
+                lowered = value.lower()
 
                 # Parse arrays [a, b, c]
                 if value.startswith("[") and value.endswith("]"):
                     value = [v.strip().strip("\"'") for v in value[1:-1].split(",")]
                 # Parse booleans
-                elif value.lower() == "true":
-                    value = True
-                elif value.lower() == "false":
-                    value = False
+                elif lowered in ("true", "false"):
+                    value = lowered == "true"
                 # Strip quotes
                 elif value.startswith('"') and value.endswith('"'):
                     value = value[1:-1]
@@ -419,194 +851,124 @@ class NotionPublisher:
         return meta, body
 
     def markdown_to_blocks(self, content: str) -> List[Dict]:
-        """Convert markdown to Notion blocks with rich formatting."""
-        blocks = []
-        lines = content.split("\n")
-        i = 0
+        """Convert a markdown body (no frontmatter) to Notion blocks with rich formatting."""
+        return list(self.iter_blocks(content))
 
-        def parse_rich_text(text: str) -> List[Dict]:
-            """Parse inline markdown to rich text annotations."""
-            rich_texts = []
+    def iter_blocks(self, content: str) -> Iterator[Dict]:
+        """Yield the Notion blocks for markdown content one at a time.
 
-            # Simple approach: split by bold/italic markers
-            # For now, just detect **bold** and *italic*
-            parts = re.split(r"(\*\*[^*]+\*\*|\*[^*]+\*|`[^`]+`)", text)
-
-            for part in parts:
-                if not part:
-                    continue
-
-                if part.startswith("**") and part.endswith("**"):
-                    rich_texts.append({"type": "text", "text": {"content": part[2:-2]}, "annotations": {"bold": True}})
-                elif part.startswith("*") and part.endswith("*") and not part.startswith("**"):
-                    rich_texts.append(
-                        {"type": "text", "text": {"content": part[1:-1]}, "annotations": {"italic": True}}
-                    )
-                elif part.startswith("`") and part.endswith("`"):
-                    rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"code": True}})
-                else:
-                    rich_texts.append({"type": "text", "text": {"content": part}})
-
-            return rich_texts if rich_texts else [{"type": "text", "text": {"content": text}}]
+        Streaming counterpart of :meth:`markdown_to_blocks`. ``content`` is a
+        document body: strip frontmatter with :meth:`parse_frontmatter` first.
+        """
+        # splitlines() also drops the "\r" of CRLF files, which split("\n") left
+        # on every line (and so in headings, fence languages and paragraphs).
+        lines = content.splitlines()
+        n = len(lines)
+        i = 0
 
-        while i < len(lines):
+        while i < n:
             line = lines[i]
 
-            # Skip frontmatter (YAML between ---)
-            if line.strip() == "---" and i == 0:
+            # Skip empty lines (isspace() tests them without strip()'s copy)
+            if not line or line.isspace():
                 i += 1
-                while i < len(lines) and lines[i].strip() != "---":
-                    i += 1
-                i += 1  # Skip closing ---
                 continue
 
-            # Skip empty lines
-            if not line.strip():
-                i += 1
-                continue
+            m = _RE_BLOCK_KIND.match(line) if line[0] in _BLOCK_LEAD_CHARS else None
+            kind = m.lastgroup if m else None
 
             # Headers
-            header_match = re.match(r"^(#{1,3})\s+(.+)$", line)
-            if header_match:
-                level = len(header_match.group(1))
-                text = header_match.group(2)
-                block_type = f"heading_{level}"
-
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": block_type,
-                        block_type: {"rich_text": parse_rich_text(text)},
-                    }
-                )
+            if kind == "header":
+                yield _text_block(f"heading_{len(m.group('hlevel'))}", _parse_rich_text(m.group("htext")))
                 i += 1
                 continue
 
             # Tables (convert to code block for better display)
-            if line.startswith("|") and i + 1 < len(lines) and lines[i + 1].startswith("|"):
+            if kind == "table" and i + 1 < n and lines[i + 1].startswith("|"):
                 table_lines = []
-                while i < len(lines) and lines[i].startswith("|"):
+                while i < n and lines[i].startswith("|"):
                     # Skip separator rows (|---|---|)
-                    if not re.match(r"^\|[-:\s|]+\|$", lines[i]):
+                    if not _RE_TABLE_SEP.match(lines[i]):
                         table_lines.append(lines[i])
                     i += 1
 
                 if table_lines:
                     # Create a simple formatted table
-                    blocks.append(
-                        {
-                            "object": "block",
-                            "type": "code",
-                            "code": {
-                                "rich_text": [{"type": "text", "text": {"content": "\n".join(table_lines)}}],
-                                "language": "plain text",
-                            },
-                        }
-                    )
+                    yield _code_block("\n".join(table_lines))
                 continue
 
             # Code blocks
-            if line.startswith("```"):
+            if kind == "fence":
                 language = line[3:].strip() or "plain text"
-                code_lines = []
-                i += 1
-
-                while i < len(lines) and not lines[i].startswith("```"):
-                    code_lines.append(lines[i])
-                    i += 1
-                i += 1  # Skip closing ```
-
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "code",
-                        "code": {
-                            "rich_text": [{"type": "text", "text": {"content": "\n".join(code_lines)}}],
-                            "language": language.lower()
-                            if language.lower() in ["python", "javascript", "json", "markdown", "sql", "bash"]
-                            else "plain text",
-                        },
-                    }
+                # Find the closing fence, then take the code lines in one slice
+                start = end = i + 1
+                while end < n and not lines[end].startswith("```"):
+                    end += 1
+                i = end + 1  # Skip closing ```
+
+                language = language.lower()
+                yield _code_block(
+                    "\n".join(lines[start:end]), language if language in _CODE_LANGUAGES else "plain text"
                 )
                 continue
 
-            # Callout (> **text** format often used for metadata)
-            if line.startswith("> **"):
-                # Collect all blockquote lines
-                quote_lines = []
-                while i < len(lines) and lines[i].startswith(">"):
-                    quote_lines.append(re.sub(r"^>\s*", "", lines[i]))
-                    i += 1
+            if kind == "quote":
+                # Callout (> **text** format often used for metadata)
+                if line.startswith("> **"):
+                    # Collect all blockquote lines
+                    quote_lines = []
+                    while i < n and lines[i].startswith(">"):
+                        quote_lines.append(_RE_QUOTE.sub("", lines[i], 1))
+                        i += 1
 
-                blocks.append(
-                    {
+                    yield {
                         "object": "block",
                         "type": "callout",
                         "callout": {
-                            "rich_text": parse_rich_text("\n".join(quote_lines)),
+                            "rich_text": _parse_rich_text("\n".join(quote_lines)),
                             "icon": {"emoji": "📊"},
                             "color": "gray_background",
                         },
                     }
-                )
-                continue
+                    continue
 
-            # Regular blockquote
-            if line.startswith(">"):
-                text = re.sub(r"^>\s*", "", line)
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "quote",
-                        "quote": {"rich_text": parse_rich_text(text)},
-                    }
-                )
+                # Regular blockquote
+                yield _text_block("quote", _parse_rich_text(_RE_QUOTE.sub("", line, 1)))
                 i += 1
                 continue
 
             # Bullet list
-            if re.match(r"^[-*]\s+", line):
-                text = re.sub(r"^[-*]\s+", "", line)
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "bulleted_list_item",
-                        "bulleted_list_item": {"rich_text": parse_rich_text(text)},
-                    }
-                )
+            if kind == "bullet":
+                yield _text_block("bulleted_list_item", _parse_rich_text(line[m.end() :]))
                 i += 1
                 continue
 
             # Numbered list
-            num_match = re.match(r"^\d+\.\s+(.+)$", line)
-            if num_match:
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "numbered_list_item",
-                        "numbered_list_item": {"rich_text": parse_rich_text(num_match.group(1))},
-                    }
-                )
+            if kind == "num":
+                yield _text_block("numbered_list_item", _parse_rich_text(m.group("ntext")))
                 i += 1
                 continue
 
             # Horizontal rule
-            if re.match(r"^---+$", line) or re.match(r"^\*\*\*+$", line):
-                blocks.append({"object": "block", "type": "divider", "divider": {}})
+            if kind == "hr":
+                yield _divider_block()
                 i += 1
                 continue
 
-            # Default: paragraph with rich text
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {"rich_text": parse_rich_text(line)},
-                }
-            )
+            # Default: paragraph with rich text. Following plain lines up to the
+            # next blank or structural line belong to the same paragraph.
+            start = i
+            para_len = len(line)
             i += 1
-
-        return blocks
+            while i < n:
+                nxt = lines[i]
+                if not nxt or nxt.isspace() or (nxt[0] in _BLOCK_LEAD_CHARS and _RE_BLOCK_KIND.match(nxt)):
+                    break
+                para_len += len(nxt) + 1
+                if para_len > _MAX_PARAGRAPH_CHARS:
+                    break
+                i += 1
+            yield _text_block("paragraph", _parse_rich_text("\n".join(lines[start:i]), _RE_INLINE_LINE))
 
     def publish(
         self,
@@ -643,26 +1005,23 @@ class NotionPublisher:
         bias = meta.get("bias")
 
         # Convert to blocks - use enhanced formatter if available
-        if use_enhanced_formatting:
-            try:
-                from scripts.chart_publisher import ChartPublisher
-                from scripts.notion_formatter import format_for_notion
+        formatter = _enhanced_formatting() if use_enhanced_formatting else None
+        if formatter is not None:
+            ChartPublisher, format_for_notion = formatter
 
-                # Try to get chart URLs for tickers in content
-                chart_urls = None
-                try:
-                    chart_pub = ChartPublisher()
-                    chart_urls = chart_pub.get_charts_for_content(body)
-                    if chart_urls:
-                        print(f"  📊 Adding charts: {', '.join(chart_urls.keys())}")
-                except Exception as e:
-                    print(f"  ⚠ Chart upload skipped: {e}")
+            # Try to get chart URLs for tickers in content. Uploads run
+            # concurrently; ChartPublisher serializes its cache writes.
+            chart_urls = None
+            try:
+                chart_urls = ChartPublisher().get_charts_for_content(body)
+                if chart_urls:
+                    logging.info("Adding charts: %s", ", ".join(chart_urls.keys()))
+            except Exception as e:
+                logging.warning("Chart upload skipped: %s", e)
 
-                blocks = format_for_notion(content, doc_type=doc_type, bias=bias, chart_urls=chart_urls)
-            except ImportError:
-                # Fallback to basic formatting
-                blocks = self.markdown_to_blocks(body)
+            blocks = format_for_notion(content, doc_type=doc_type, bias=bias, chart_urls=chart_urls)
         else:
+            # Fallback to basic formatting
             blocks = self.markdown_to_blocks(body)
 
         # Frontmatter validation and tag normalization
@@ -704,22 +1063,22 @@ class NotionPublisher:
             return errs
 
         def _normalize_tags(tag_list: List[str]) -> List[str]:
-            out = []
+            out = {}  # ordered set
             for t in tag_list or []:
                 try:
                     tn = str(t).strip()
                     # Remove stray punctuation
-                    tn = re.sub(r"[^A-Za-z0-9\-\._ /]", "", tn)
+                    tn = _RE_TAG_JUNK.sub("", tn)
                     # If looks like a ticker symbol, uppercase
                     if tn.isupper() or (len(tn) <= 5 and tn.replace(".", "").isalpha()):
                         tn = tn.upper()
                     else:
                         tn = tn.title()
-                    if tn and tn not in out:
-                        out.append(tn)
+                    if tn:
+                        out[tn] = None
                 except Exception:
                     continue
-            return out
+            return list(out)
 
         # Run frontmatter validation
         fm_errors = _validate_frontmatter(meta)
@@ -741,46 +1100,6 @@ class NotionPublisher:
         except Exception:
             pass
 
-        # Helper: normalize dates and map values to Notion property payloads
-        def _normalize_date(val: str) -> str:
-            if not val:
-                return None
-            # Accept ISO-like strings or common formats; prefer YYYY-MM-DD
-            try:
-                # Fast path: already ISO
-                if isinstance(val, str) and re.match(r"^\d{4}-\d{2}-\d{2}", val):
-                    return val.split("T")[0]
-                # Try fromisoformat
-                try:
-                    return datetime.fromisoformat(val).date().isoformat()
-                except Exception:
-                    pass
-                # Try known formats
-                for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y", "%Y/%m/%d"):
-                    try:
-                        return datetime.strptime(val, fmt).date().isoformat()
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-            return None
-
-        def _map_relation(prop_value):
-            # Accept list of notion page ids or a single id
-            if not prop_value:
-                return []
-            if isinstance(prop_value, str):
-                return [{"id": prop_value}]
-            if isinstance(prop_value, list):
-                out = []
-                for v in prop_value:
-                    if isinstance(v, dict) and v.get("id"):
-                        out.append({"id": v["id"]})
-                    elif isinstance(v, str):
-                        out.append({"id": v})
-                return out
-            return []
-
         # Date property: normalize and use date if DB has it
         try:
             nd = _normalize_date(doc_date)
@@ -792,11 +1111,7 @@ class NotionPublisher:
         # Tags property: prefer multi_select when DB has it; ensure unique names
         try:
             if tags and "Tags" in db_props and db_props["Tags"].get("type") == "multi_select":
-                uniq = []
-                for t in tags:
-                    tn = str(t).strip()
-                    if tn and tn not in uniq:
-                        uniq.append(tn)
+                uniq = dict.fromkeys(tn for tn in (str(t).strip() for t in tags) if tn)
                 properties["Tags"] = {"multi_select": [{"name": t} for t in uniq]}
         except Exception:
             pass
@@ -831,7 +1146,7 @@ class NotionPublisher:
         # Determine parent to use for page creation - prefer a specific data_source_id when available
         parent = {"database_id": self.config.database_id}
         try:
-            ds_id = os.getenv("NOTION_DATA_SOURCE_ID") or getattr(self, "_data_source_id", None)
+            ds_id = self._env_data_source_id or getattr(self, "_data_source_id", None)
             if not ds_id:
                 # Trigger discovery (which will populate _data_source_id if possible)
                 _ = self._get_database_properties()
@@ -869,6 +1184,9 @@ class NotionPublisher:
             else:
                 return {"dry_run": True, "valid": True, "blocks": len(blocks)}
 
+        # Notion takes at most 100 children on create; the rest is appended below
+        first_blocks = blocks[:_MAX_CHILDREN_PER_REQUEST]
+
         # Create page with robust retry logic, exponential backoff, jitter and structured logging
         attempts = int(os.getenv("NOTION_PUBLISH_ATTEMPTS", "7"))
         base_delay = float(os.getenv("NOTION_PUBLISH_BASE_DELAY", "2"))
@@ -878,16 +1196,24 @@ class NotionPublisher:
                 logging.info("Notion publish attempt %d/%d", attempt, attempts)
                 # Try to prefer a client-level timeout if available; otherwise rely on retries/backoff
                 try:
-                    response = self.client.pages.create(parent=parent, properties=properties, children=blocks[:100])
+                    response = self.client.pages.create(parent=parent, properties=properties, children=first_blocks)
                 except TypeError:
                     # Older client may not accept kwargs the same way; fall back to direct call
-                    response = self.client.pages.create(parent=parent, properties=properties, children=blocks[:100])
+                    response = self.client.pages.create(parent=parent, properties=properties, children=first_blocks)
                 last_exc = None
                 logging.info("Notion publish succeeded on attempt %d", attempt)
                 break
             except Exception as e:
                 last_exc = e
-                logging.exception("Notion publish attempt %d failed", attempt)
+                # Keep retried attempts to one line; the traceback is logged once on final failure
+                logging.warning("Notion publish attempt %d/%d failed: %r", attempt, attempts, e)
+
+                if _is_transient_notion_error(e):
+                    # Rate limited or Notion-side failure: the schema fallbacks
+                    # below would only spend more requests, so just back off
+                    if attempt < attempts:
+                        base_delay = _backoff_sleep(base_delay, _retry_after_seconds(e))
+                    continue
 
                 # If it's a property-type error, attempt the Status/Minimal fallbacks before retrying
                 try:
@@ -944,6 +1270,8 @@ class NotionPublisher:
                                 # For select/status types we can attempt to add the option to the database schema
                                 if prop_type in ("select", "status"):
                                     logging.info("Adding missing Status option '%s' to database schema", desired_norm)
+                                    # The options list below is edited in place; stop serving it from the cache
+                                    self._db_props_cache = None
                                     # Retrieve existing options payload
                                     options_payload = (
                                         prop_payload.get(prop_type, {}).get("options", [])
@@ -962,22 +1290,22 @@ class NotionPublisher:
                                         db_props = self._get_database_properties()
                                         logging.info("Status option upserted; retrying publish")
                                         response = self.client.pages.create(
-                                            parent=parent, properties=properties, children=blocks[:100]
+                                            parent=parent, properties=properties, children=first_blocks
                                         )
                                         last_exc = None
                                         break
-                                    except Exception:
-                                        logging.exception(
-                                            "Failed to upsert Status option; will fallback to minimal create"
+                                    except Exception as e2:
+                                        logging.warning(
+                                            "Failed to upsert Status option; will fallback to minimal create: %r", e2
                                         )
-                            except Exception:
-                                logging.exception("Status option upsert attempt failed")
+                            except Exception as e2:
+                                logging.warning("Status option upsert attempt failed: %r", e2)
                         # If types mismatch, try alternate representation
                         if prop_type == "status" and "select" in properties["Status"]:
                             properties["Status"] = {"status": {"name": properties["Status"]["select"]["name"]}}
                             logging.info("Retrying with Status as 'status' type")
                             response = self.client.pages.create(
-                                parent=parent, properties=properties, children=blocks[:100]
+                                parent=parent, properties=properties, children=first_blocks
                             )
                             last_exc = None
                             break
@@ -985,56 +1313,84 @@ class NotionPublisher:
                             properties["Status"] = {"select": {"name": properties["Status"]["status"]["name"]}}
                             logging.info("Retrying with Status as 'select' type")
                             response = self.client.pages.create(
-                                parent=parent, properties=properties, children=blocks[:100]
+                                parent=parent, properties=properties, children=first_blocks
                             )
                             last_exc = None
                             break
-                except Exception:
-                    logging.exception("Status fallback failed")
+                except Exception as e2:
+                    logging.warning("Status fallback failed: %r", e2)
 
                 # As a last resort, try a minimal create with title only
                 try:
                     minimal_props = {"title": properties.get("title")}
                     logging.info("Attempting minimal create (title-only)")
-                    response = self.client.pages.create(parent=parent, properties=minimal_props, children=blocks[:100])
+                    response = self.client.pages.create(parent=parent, properties=minimal_props, children=first_blocks)
                     last_exc = None
                     break
-                except Exception:
-                    logging.exception("Minimal create failed")
+                except Exception as e2:
+                    logging.warning("Minimal create failed: %r", e2)
 
-                # Backoff with jitter
-                import time
+                if _is_client_notion_error(e):
+                    # Notion rejected the request itself and the fallbacks failed
+                    # too; sending it again unchanged cannot succeed
+                    logging.error("Notion rejected the page (HTTP %s); not retrying", e.status)
+                    break
 
-                jitter = random.uniform(0, 0.3 * base_delay)
-                sleep_time = base_delay + jitter
-                logging.info("Backing off for %.2fs before retrying", sleep_time)
-                time.sleep(sleep_time)
-                base_delay *= 2
+                # Backoff with jitter
+                if attempt < attempts:
+                    base_delay = _backoff_sleep(base_delay)
 
         if last_exc:
-            # Raise a combined error with context for debugging and send an alert
-            logging.exception("Final Notion publish failure after %d attempts", attempts)
+            # Raise a combined error with context for debugging and send an alert.
+            # `attempt` is the last one made; a rejected request stops the loop early.
+            logging.error(
+                "Final Notion publish failure after %d attempts",
+                attempt,
+                exc_info=(type(last_exc), last_exc, last_exc.__traceback__),
+            )
             try:
                 from scripts.notifier import send_discord
 
-                send_discord(f"Notion publish failed after {attempts} attempts: {last_exc}")
+                send_discord(f"Notion publish failed after {attempt} attempts: {last_exc}")
             except Exception:
                 logging.exception("Failed to send failure alert")
-            raise Exception(f"Failed to publish to Notion after {attempts} attempts; last error: {last_exc!r}")
+            raise Exception(f"Failed to publish to Notion after {attempt} attempts; last error: {last_exc!r}")
+
+        page_id = response["id"]
+        appended = 0
+        if len(blocks) > _MAX_CHILDREN_PER_REQUEST:
+            appended = self._append_children(page_id, blocks[_MAX_CHILDREN_PER_REQUEST:])
 
         # Track usage
         try:
             from scripts.cleanup_manager import CleanupManager
 
-            CleanupManager().record_notion_page(len(blocks[:100]))
+            CleanupManager().record_notion_page(len(first_blocks) + appended)
         except Exception:
             pass
 
-        page_id = response["id"]
         url = response.get("url", f"https://notion.so/{page_id.replace('-', '')}")
 
         return {"page_id": page_id, "url": url, "type": doc_type, "tags": tags}
 
+    def _append_children(self, block_id: str, blocks: List[Dict]) -> int:
+        """Append blocks under an existing page in request-sized chunks.
+
+        Chunks go out one after another because Notion appends each request to
+        the end of the page; concurrent appends would interleave the content.
+        Stops at the first failed chunk and returns how many blocks were added.
+        """
+        appended = 0
+        for start in range(0, len(blocks), _MAX_CHILDREN_PER_REQUEST):
+            chunk = blocks[start : start + _MAX_CHILDREN_PER_REQUEST]
+            try:
+                self.client.blocks.children.append(block_id=block_id, children=chunk)
+            except Exception:
+                logging.exception("Failed to append %d remaining blocks to page %s", len(blocks) - appended, block_id)
+                break
+            appended += len(chunk)
+        return appended
+
     def sync_file(
         self, filepath: str, doc_type: str = None, tags: List[str] = None, force: bool = False, dry_run: bool = False
     ) -> Dict[str, str]:
@@ -1055,24 +1411,43 @@ class NotionPublisher:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {filepath}")
 
-        content = path.read_text(encoding="utf-8")
-        filename = path.name
+        # Enforce repository-level ignore patterns: never publish these files to Notion.
+        # Checked before reading so excluded files are never loaded at all.
+        if _is_ignored_path(path):
+            return {
+                "page_id": "",
+                "url": "",
+                "type": doc_type or "notes",
+                "tags": [],
+                "skipped": True,
+                "reason": "excluded_pattern",
+            }
 
-        # Enforce repository-level ignore patterns: never publish these files to Notion
-        try:
-            fname_lower = filename.lower()
-            for pat in IGNORE_PATTERNS:
-                if pat.lower() in fname_lower or pat.lower() in str(path).lower():
+        # Stat fast path: a file whose size and mtime match its notion_sync row is
+        # skipped before it is read or the lifecycle tables and lock are touched
+        if DB_AVAILABLE and not force:
+            try:
+                synced = get_db().get_notion_page_for_file(str(path))
+                st = path.stat()
+                if (
+                    synced
+                    and synced.get("file_mtime_ns") is not None
+                    and (st.st_size, st.st_mtime_ns) == (synced["file_size"], synced["file_mtime_ns"])
+                ):
                     return {
-                        "page_id": "",
-                        "url": "",
-                        "type": doc_type or "notes",
+                        "page_id": synced.get("notion_page_id", ""),
+                        "url": synced.get("notion_url", ""),
+                        "type": synced.get("doc_type", "notes"),
                         "tags": [],
                         "skipped": True,
-                        "reason": "excluded_pattern",
+                        "reason": "File unchanged since last sync",
                     }
-        except Exception:
-            pass
+            except Exception:
+                # Without the row, fall through to the full content checks
+                pass
+
+        content = path.read_text(encoding="utf-8")
+        filename = path.name
 
         # Normalize path and compute a stronger content fingerprint for DB checks
         normalized_path = str(path)
@@ -1100,15 +1475,16 @@ class NotionPublisher:
                 "reason": "already_synced_frontmatter",
             }
 
+        # Title from H1 or filename; feeds both the fingerprint and the published page
+        h1_match = _RE_H1.search(content)
+        raw_title = h1_match.group(1).strip() if h1_match else filename.replace(".md", "").replace("_", " ")
+
         # Compute a deterministic strong fingerprint (title + frontmatter + normalized body)
         try:
-            title_for_hash = None
-            h1_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-            title_for_hash = h1_match.group(1).strip() if h1_match else filename.replace(".md", "").replace("_", " ")
             # Unescape and strip tags for fingerprinting
-            title_for_hash = html.unescape(title_for_hash)
-            title_for_hash = re.sub(r"<[^>]+>", "", title_for_hash)
-            body_norm = re.sub(r"\s+", " ", html.unescape(body)).strip()
+            title_for_hash = html.unescape(raw_title)
+            title_for_hash = _RE_HTML_TAG.sub("", title_for_hash)
+            body_norm = _RE_WS.sub(" ", html.unescape(body)).strip()
             meta_str = "" if not meta else ",".join(f"{k}={meta[k]}" for k in sorted(meta.keys()))
             fingerprint_source = "\n".join([title_for_hash, meta_str, body_norm])
             file_hash = hashlib.sha256(fingerprint_source.encode("utf-8")).hexdigest()
@@ -1276,14 +1652,32 @@ class NotionPublisher:
         # Acquire per-file publish lock to avoid concurrent publishes creating duplicates
         # Ensure locks live under the project cache directory to avoid trying to
         # create a directory with the raw database id as a top-level path.
-        lock_dir = Path.home() / ".cache" / "syndicate" / (self.config.database_id or "notion") / "notion_locks"
-        lock_dir.mkdir(parents=True, exist_ok=True)
-        lock_name = hashlib.md5(str(path).encode()).hexdigest() + ".lock"
-        lock_path = lock_dir / lock_name
+        lock_name = hashlib.blake2b(str(path).encode(), digest_size=16).hexdigest() + ".lock"
+        lock_path = _lock_dir(_state_dir(self.config.database_id)) / lock_name
+
+        # A soft lock (FileLock where the OS has no file locking) is held by the
+        # lock file existing, so a crashed run leaves it behind. Clear one
+        # untouched for longer than NOTION_LOCK_STALE_SECONDS; live holders keep
+        # its mtime fresh. OS locks are released with their holder, so their
+        # files are never removed.
+        soft_lock = issubclass(FileLock, SoftFileLock)
+        try:
+            stale_after = float(os.environ.get("NOTION_LOCK_STALE_SECONDS", "900"))
+        except Exception:
+            stale_after = 900.0
+        if soft_lock:
+            try:
+                if time.time() - lock_path.stat().st_mtime > stale_after:
+                    logging.warning("Removing stale publish lock %s", lock_path)
+                    lock_path.unlink()
+            except OSError:
+                pass
 
         try:
-            lock = FileLock(str(lock_path), timeout=5)
-            lock.acquire()
+            # Don't wait: a sync worker blocked on a busy file holds up the pool,
+            # and whoever holds the lock is publishing this file already
+            lock = FileLock(str(lock_path))
+            lock.acquire(timeout=0)
         except Exception:
             # Another process is publishing this file - skip to avoid duplicates
             return {
@@ -1295,11 +1689,15 @@ class NotionPublisher:
                 "reason": "publish_in_progress",
             }
 
+        released = threading.Event()
+        if soft_lock:
+            threading.Thread(
+                target=_refresh_lock_mtime, args=(lock_path, released, stale_after / 3), daemon=True
+            ).start()
+
         try:
             # Re-check file unchanged and frontmatter before doing actual publish
-            # Extract title from H1 or filename
-            h1_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-            title = h1_match.group(1).strip() if h1_match else filename.replace(".md", "").replace("_", " ")
+            title = raw_title
 
             # Sanitize title: strip HTML tags and unescape entities to avoid corrupted Notion titles
             def _sanitize_title(s: str) -> str:
@@ -1308,8 +1706,8 @@ class NotionPublisher:
                 try:
                     # Unescape HTML entities then remove tags
                     t = html.unescape(s)
-                    t = re.sub(r"<[^>]+>", "", t)
-                    t = re.sub(r"\s+", " ", t).strip()
+                    t = _RE_HTML_TAG.sub("", t)
+                    t = _RE_WS.sub(" ", t).strip()
                     return t
                 except Exception:
                     return s
@@ -1319,17 +1717,6 @@ class NotionPublisher:
                 title=title, content=content, doc_type=doc_type, tags=tags, filename=filename, dry_run=dry_run
             )
 
-            # Record the sync in the database, using the strong fingerprint when available
-            if DB_AVAILABLE:
-                db = get_db()
-                try:
-                    db.record_notion_sync(
-                        str(path), result["page_id"], result["url"], result.get("type", "notes"), file_hash=file_hash
-                    )
-                except TypeError:
-                    # Older DB manager without optional param - fall back
-                    db.record_notion_sync(str(path), result["page_id"], result["url"], result.get("type", "notes"))
-
             # ══════════════════════════════════════════════════════════════════════════════
             # UPDATE SOURCE FILE: Mark file as synced with notion_page_id in frontmatter
             # ══════════════════════════════════════════════════════════════════════════════
@@ -1343,7 +1730,21 @@ class NotionPublisher:
                 except Exception as e:
                     logging.warning("Failed to update source file with notion_page_id: %s", e)
 
+            # Record the sync in the database, using the strong fingerprint when available.
+            # After the frontmatter rewrite, so the size/mtime stored with the row
+            # match the file as it now sits on disk.
+            if DB_AVAILABLE:
+                db = get_db()
+                try:
+                    db.record_notion_sync(
+                        str(path), result["page_id"], result["url"], result.get("type", "notes"), file_hash=file_hash
+                    )
+                except TypeError:
+                    # Older DB manager without optional param - fall back
+                    db.record_notion_sync(str(path), result["page_id"], result["url"], result.get("type", "notes"))
+
         finally:
+            released.set()
             try:
                 lock.release()
             except Exception:
@@ -1416,6 +1817,47 @@ class NotionPublisher:
         return results
 
 
+def _state_dir(database_id: str) -> Path:
+    """Per-database directory for publish locks."""
+    return Path.home() / ".cache" / "syndicate" / (database_id or "notion")
+
+
+@lru_cache(maxsize=None)
+def _refresh_lock_mtime(lock_path: Path, released: threading.Event, interval: float) -> None:
+    """Touch a held soft lock every ``interval`` seconds until ``released`` is set.
+
+    Keeps a long publish (e.g. one waiting out Retry-After) from looking stale
+    to other processes.
+    """
+    while not released.wait(interval):
+        try:
+            os.utime(lock_path)
+        except OSError:
+            pass
+
+
+def _lock_dir(state_dir: Path) -> Path:
+    """The publish lock directory under ``state_dir``, created once per process."""
+    lock_dir = state_dir / "notion_locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    return lock_dir
+
+
+def _iter_markdown_files(root: str) -> Iterator[Path]:
+    """Yield the .md files under ``root``, skipping FILE_INDEX files and archive/ directories.
+
+    Walks with os.scandir so the directory entry type comes from the scan itself
+    instead of a stat() per path as with Path.glob("**/*.md").
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name != "archive":
+                    yield from _iter_markdown_files(entry.path)
+            elif entry.name.endswith(".md") and "FILE_INDEX" not in entry.name and entry.is_file():
+                yield Path(entry.path)
+
+
 def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
     """
     Sync all Syndicate outputs to Notion with intelligent deduplication.
@@ -1449,51 +1891,54 @@ def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool
     publisher = NotionPublisher(no_client_ok=dry_run)
     results = {"success": [], "skipped": [], "failed": []}
 
-    # Find all markdown files recursively
-    md_files = list(output_path.glob("**/*.md"))
-
-    # Filter out index files and archive
-    md_files = [f for f in md_files if "FILE_INDEX" not in f.name and "/archive/" not in str(f).replace("\\", "/")]
-
-    # Apply repository-level ignore patterns so certain internal files (digests, executor outputs)
-    # never get published even when --force is used.
-    def _is_ignored(fpath: Path) -> bool:
-        try:
-            name = fpath.name.lower()
-            s = str(fpath).lower()
-            for p in IGNORE_PATTERNS:
-                if p.lower() in name or p.lower() in s:
-                    return True
-        except Exception:
-            return False
-        return False
-
-    md_files = [f for f in md_files if not _is_ignored(f)]
-
-    for filepath in md_files:
-        try:
-            result = publisher.sync_file(str(filepath), force=force, dry_run=dry_run)
+    # Find all markdown files recursively (index files and archive/ are skipped by the walk).
+    # Repository-level ignore patterns keep certain internal files (digests, executor outputs)
+    # from ever being published, even when --force is used.
+    md_files = [Path(os.path.abspath(f)) for f in _iter_markdown_files(str(output_path)) if not _is_ignored_path(f)]
+
+    # Each sync is dominated by Notion round-trips, so overlap them on a small
+    # thread pool. Per-file FileLocks still guard against duplicate publishes,
+    # and results are collected here on the calling thread.
+    workers = max(1, min(int(os.getenv("NOTION_SYNC_WORKERS", "8")), len(md_files) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        future_to_file = {
+            ex.submit(publisher.sync_file, str(filepath), force=force, dry_run=dry_run): filepath
+            for filepath in md_files
+        }
+        for fut in as_completed(future_to_file):
+            filepath = future_to_file[fut]
+            try:
+                result = fut.result()
+
+                # Support future dry-run flows where sync_file returns dry_run results
+                if result.get("dry_run"):
+                    if result.get("valid"):
+                        results["success"].append(
+                            {"file": filepath.name, "dry_run": True, "blocks": result.get("blocks")}
+                        )
+                    else:
+                        results["failed"].append({"file": filepath.name, "error": result.get("errors")})
+                        print(f"✗ {filepath.name} (dry-run): {result.get('errors')}")
+                    continue
 
-            # Support future dry-run flows where sync_file returns dry_run results
-            if result.get("dry_run"):
-                if result.get("valid"):
-                    results["success"].append({"file": filepath.name, "dry_run": True, "blocks": result.get("blocks")})
+                if result.get("skipped"):
+                    results["skipped"].append({"file": filepath.name, "reason": result.get("reason", "unchanged")})
+                    # Don't print for skipped files to reduce noise
                 else:
-                    results["failed"].append({"file": filepath.name, "error": result.get("errors")})
-                    print(f"✗ {filepath.name} (dry-run): {result.get('errors')}")
-                continue
+                    results["success"].append(
+                        {
+                            "file": filepath.name,
+                            "page_id": result["page_id"],
+                            "type": result["type"],
+                            "url": result["url"],
+                        }
+                    )
+                    print(f"✓ {filepath.name} → {result['type']}")
+            except Exception as e:
+                results["failed"].append({"file": filepath.name, "error": str(e)})
+                print(f"✗ {filepath.name}: {e}")
 
-            if result.get("skipped"):
-                results["skipped"].append({"file": filepath.name, "reason": result.get("reason", "unchanged")})
-                # Don't print for skipped files to reduce noise
-            else:
-                results["success"].append(
-                    {"file": filepath.name, "page_id": result["page_id"], "type": result["type"], "url": result["url"]}
-                )
-                print(f"✓ {filepath.name} → {result['type']}")
-        except Exception as e:
-            results["failed"].append({"file": filepath.name, "error": str(e)})
-            print(f"✗ {filepath.name}: {e}")
+    publisher.close()
 
     # Mark task as run (only for real runs)
     if DB_AVAILABLE and not dry_run:
@@ -50,3 +50,47 @@ def test_save_action_insights_with_extra_fields(tmp_path: Path):
             assert row[1] == "pending"
             assert isinstance(row[2], str)
             assert "unit_test" in row[2]
+
+
+def test_get_file_hash_reuses_hash_until_file_changes(tmp_path: Path, monkeypatch):
+    import builtins
+    import os
+
+    db = DatabaseManager(db_path=tmp_path / "test.db")
+    md = tmp_path / "a.md"
+    md.write_text("first")
+
+    first = db.get_file_hash(str(md))
+    opened = []
+    real_open = builtins.open
+    monkeypatch.setattr(builtins, "open", lambda f, *a, **k: opened.append(f) or real_open(f, *a, **k))
+    assert db.get_file_hash(str(md)) == first
+    assert opened == []
+
+    md.write_text("second")
+    st = md.stat()
+    os.utime(md, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert db.get_file_hash(str(md)) not in ("", first)
+
+
+def test_is_file_synced_matches_recorded_size_and_mtime(tmp_path: Path):
+    import os
+
+    db = DatabaseManager(db_path=tmp_path / "test.db")
+    md = tmp_path / "a.md"
+    md.write_text("body")
+
+    # The stored fingerprint is not a hash of the file bytes, as with sync_file
+    db.record_notion_sync(str(md), "page-1", "u", "reports", file_hash="fingerprint")
+    assert db.is_file_synced(str(md)) is True
+
+    md.write_text("changed")
+    st = md.stat()
+    os.utime(md, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert db.is_file_synced(str(md)) is False
+
+    # A reset sync row means the file is no longer considered synced
+    db.record_notion_sync(str(md), "page-1", "u", "reports", file_hash="fingerprint")
+    assert db.is_file_synced(str(md)) is True
+    db.clear_sync_for_file(str(md))
+    assert db.is_file_synced(str(md)) is False
@@ -30,3 +30,23 @@ def test_send_discord_no_url(monkeypatch):
     monkeypatch.setattr('requests.post', lambda *a, **k: (_ for _ in ()).throw(RuntimeError('fail')))
     ok = send_discord('x', webhook_url=None)
     assert ok is False
+
+
+def test_send_discord_logs_traceback_once(monkeypatch, caplog):
+    import logging
+    import time
+
+    def failing_post(url, json=None, timeout=None):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr('requests.post', failing_post)
+    monkeypatch.setattr(time, 'sleep', lambda s: None)
+
+    with caplog.at_level(logging.WARNING):
+        ok = send_discord('x', webhook_url='https://discord.test/webhook')
+
+    assert ok is False
+    with_tb = [r for r in caplog.records if r.exc_info]
+    assert len(with_tb) == 1
+    assert with_tb[0].levelno == logging.ERROR
+    assert sum(1 for r in caplog.records if r.levelno == logging.WARNING) == 3
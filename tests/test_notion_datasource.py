@@ -25,15 +25,15 @@ class DummyResponse:
 def test_discover_data_source_and_schema(monkeypatch):
     dbid = "db-abc"
 
-    def fake_get(url, headers=None, timeout=None):
+    def fake_get(session, url, headers=None, timeout=None):
         if url.endswith(f"/databases/{dbid}"):
             return DummyResponse({"data_sources": [{"id": "ds-1", "name": "Main Source"}]})
         elif url.endswith("/data_sources/ds-1"):
             return DummyResponse({"properties": {"Status": {"type": "status"}, "Tags": {"type": "multi_select"}}})
         raise AssertionError(f"Unexpected url {url}")
 
-    # Patch top-level requests.get so internal imports in the module resolve
-    monkeypatch.setattr("requests.get", fake_get)
+    # Patch requests.Session.get; the publisher reuses one keep-alive session
+    monkeypatch.setattr("requests.Session.get", fake_get)
 
     p = NotionPublisher(NotionConfig(api_key="x", database_id=dbid))
 
@@ -0,0 +1,77 @@
+import types
+
+from scripts.notion_formatter import NotionFormatter, parse_inline_formatting, parse_markdown_table
+
+
+def _spans(rt):
+    return [
+        (r["text"]["content"], r["annotations"]["bold"], r["annotations"]["italic"], r["annotations"]["code"])
+        for r in rt
+    ]
+
+
+def test_inline_formatting_tokens():
+    rt = parse_inline_formatting("a ***bi*** b **bold** c *it* d `code` e")
+    assert _spans(rt) == [
+        ("a ", False, False, False),
+        ("bi", True, True, False),
+        (" b ", False, False, False),
+        ("bold", True, False, False),
+        (" c ", False, False, False),
+        ("it", False, True, False),
+        (" d ", False, False, False),
+        ("code", False, False, True),
+        (" e", False, False, False),
+    ]
+
+
+def test_inline_formatting_drops_unclosed_delimiters():
+    assert _spans(parse_inline_formatting("a*b")) == [("a", False, False, False), ("b", False, False, False)]
+    # Spans never cross a newline
+    assert _spans(parse_inline_formatting("*a\nb*")) == [("a\nb", False, False, False)]
+    # Nothing parseable falls back to the raw text
+    assert _spans(parse_inline_formatting("*")) == [("*", False, False, False)]
+
+
+def test_inline_formatting_plain_text_fast_path():
+    rt = parse_inline_formatting("Gold at $2,650", default_color="green")
+    assert len(rt) == 1
+    assert rt[0]["text"]["content"] == "Gold at $2,650"
+    assert rt[0]["annotations"]["color"] == "green"
+
+
+def test_iter_document_streams_same_blocks_as_format_document():
+    content = "---\nbias: bearish\n---\n# Title\n\n- item\n\n| a | b |\n|---|---|\n| 1 | 2 |\n"
+    stream = NotionFormatter().iter_document(content, "reports")
+    assert isinstance(stream, types.GeneratorType)
+    assert list(stream) == NotionFormatter().format_document(content, "reports")
+
+
+def test_parse_markdown_table_skips_multi_column_separator():
+    lines = ["| A | B |", "|:---|---:|", "| 1 | 2 |", "text"]
+    rows, end = parse_markdown_table(lines, 0)
+    assert rows == [["A", "B"], ["1", "2"]]
+    assert end == 3
+
+
+def _body(blocks):
+    # Drop the header callout
+    return [(b["type"], "".join(r["text"]["content"] for r in b[b["type"]]["rich_text"])) for b in blocks[1:]]
+
+
+def test_consecutive_paragraph_lines_are_coalesced():
+    content = "first line\nsecond line\n\nnew paragraph\nRSI at 70\n- bullet\nafter"
+    blocks = NotionFormatter().format_document(content, "notes")
+    assert _body(blocks) == [
+        ("paragraph", "first line\nsecond line"),
+        ("paragraph", "new paragraph"),
+        ("paragraph", "RSI at 70"),
+        ("bulleted_list_item", "bullet"),
+        ("paragraph", "after"),
+    ]
+
+
+def test_coalesced_paragraphs_respect_notion_text_limit():
+    line = "x" * 900
+    blocks = NotionFormatter().format_document("\n".join([line] * 3), "notes")
+    assert [len(text) for _, text in _body(blocks)] == [1801, 900]
@@ -34,3 +34,133 @@ def test_sync_file_skips_when_lock_unavailable(monkeypatch, tmp_path):
     res = pub.sync_file(str(md))
     assert res.get("skipped") is True
     assert res.get("reason") == "publish_in_progress"
+
+
+def test_sync_file_does_not_wait_for_a_held_lock(monkeypatch, tmp_path):
+    import hashlib
+    import time
+
+    import filelock
+
+    import scripts.notion_publisher as np_mod
+
+    md = tmp_path / "test.md"
+    md.write_text("---\nstatus: published\n---\n# Test\n\nContent")
+
+    def fake_init(self, *args, **kwargs):
+        self.config = type("C", (), {"database_id": "TESTDB"})
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setattr(NotionPublisher, "__init__", fake_init)
+    monkeypatch.setattr(np_mod, "DB_AVAILABLE", False)
+
+    # Hold the file's lock the way a concurrent publisher would
+    lock_name = hashlib.blake2b(str(md.resolve()).encode(), digest_size=16).hexdigest() + ".lock"
+    held = filelock.FileLock(str(np_mod._lock_dir(np_mod._state_dir("TESTDB")) / lock_name))
+    held.acquire()
+    try:
+        start = time.monotonic()
+        res = NotionPublisher().sync_file(str(md))
+        assert time.monotonic() - start < 1
+        assert res.get("reason") == "publish_in_progress"
+    finally:
+        held.release()
+
+
+def test_sync_file_clears_a_stale_lock_file(monkeypatch, tmp_path):
+    import hashlib
+    import os
+    import time
+
+    import filelock
+
+    import scripts.notion_publisher as np_mod
+
+    md = tmp_path / "test.md"
+    md.write_text("---\nstatus: published\nai_processed: true\n---\n# Test\n\nContent")
+
+    def fake_init(self, *args, **kwargs):
+        self.config = type("C", (), {"database_id": "TESTDB"})
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setattr(NotionPublisher, "__init__", fake_init)
+    monkeypatch.setattr(NotionPublisher, "publish", lambda self, **k: {"page_id": "p", "url": "u", "type": "notes"})
+    monkeypatch.setattr(np_mod, "DB_AVAILABLE", False)
+    # Soft locks are held by the file's mere existence, so a crash leaves them behind
+    monkeypatch.setattr(np_mod, "FileLock", filelock.SoftFileLock)
+
+    # Lock file left behind by a publisher that died an hour ago
+    lock_name = hashlib.blake2b(str(md.resolve()).encode(), digest_size=16).hexdigest() + ".lock"
+    lock_path = np_mod._lock_dir(np_mod._state_dir("TESTDB")) / lock_name
+    lock_path.write_text("")
+    hour_ago = time.time() - 3600
+    os.utime(lock_path, (hour_ago, hour_ago))
+
+    assert NotionPublisher().sync_file(str(md))["skipped"] is False
+
+
+def test_sync_file_keeps_an_old_lock_file_that_is_still_held(monkeypatch, tmp_path):
+    import hashlib
+    import os
+    import time
+
+    import filelock
+
+    import scripts.notion_publisher as np_mod
+
+    md = tmp_path / "test.md"
+    md.write_text("---\nstatus: published\n---\n# Test\n\nContent")
+
+    def fake_init(self, *args, **kwargs):
+        self.config = type("C", (), {"database_id": "TESTDB"})
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setattr(NotionPublisher, "__init__", fake_init)
+    monkeypatch.setattr(np_mod, "DB_AVAILABLE", False)
+
+    # An OS lock held by a long-running publish whose file was last touched an hour ago
+    lock_name = hashlib.blake2b(str(md.resolve()).encode(), digest_size=16).hexdigest() + ".lock"
+    lock_path = np_mod._lock_dir(np_mod._state_dir("TESTDB")) / lock_name
+    held = filelock.FileLock(str(lock_path))
+    held.acquire()
+    try:
+        hour_ago = time.time() - 3600
+        os.utime(lock_path, (hour_ago, hour_ago))
+        assert NotionPublisher().sync_file(str(md)).get("reason") == "publish_in_progress"
+        assert lock_path.exists()
+    finally:
+        held.release()
+
+
+def test_long_publish_keeps_its_soft_lock_fresh(monkeypatch, tmp_path):
+    import hashlib
+    import time
+
+    import filelock
+
+    import scripts.notion_publisher as np_mod
+
+    md = tmp_path / "test.md"
+    md.write_text("---\nstatus: published\nai_processed: true\n---\n# Test\n\nContent")
+    lock_name = hashlib.blake2b(str(md.resolve()).encode(), digest_size=16).hexdigest() + ".lock"
+    ages = []
+
+    def slow_publish(self, **kwargs):
+        time.sleep(0.5)
+        ages.append(time.time() - lock_path.stat().st_mtime)
+        return {"page_id": "p", "url": "u", "type": "notes"}
+
+    def fake_init(self, *args, **kwargs):
+        self.config = type("C", (), {"database_id": "TESTDB"})
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("NOTION_LOCK_STALE_SECONDS", "0.3")
+    monkeypatch.setattr(NotionPublisher, "__init__", fake_init)
+    monkeypatch.setattr(NotionPublisher, "publish", slow_publish)
+    monkeypatch.setattr(np_mod, "DB_AVAILABLE", False)
+    monkeypatch.setattr(np_mod, "FileLock", filelock.SoftFileLock)
+    lock_path = np_mod._lock_dir(np_mod._state_dir("TESTDB")) / lock_name
+
+    assert NotionPublisher().sync_file(str(md))["skipped"] is False
+    # Refreshed while publishing, so it never aged past the stale threshold
+    assert ages and ages[0] < 0.3
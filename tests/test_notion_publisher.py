@@ -0,0 +1,450 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.notion_publisher import NotionPublisher
+
+
+def _publisher():
+    return NotionPublisher.__new__(NotionPublisher)
+
+
+def test_extract_tags_normalizes_tickers_and_keywords():
+    content = "XAUUSD and gc=f rallied; SPX/ES=F slipped. The Federal Reserve and fomc eye a rate cut. bullish GDXJ"
+    tags = _publisher().extract_tags(content)
+    assert tags == ["Bullish", "FOMC", "Fed", "GDXJ", "GOLD", "Rate Cut", "SPY"]
+
+
+def test_extract_tags_respects_word_boundaries():
+    assert _publisher().extract_tags("GOLDEN XAUUSDT Federalist") == []
+
+
+def test_parse_frontmatter_keeps_dates_as_strings():
+    meta, body = _publisher().parse_frontmatter(
+        "---\ndate: 2025-01-02\ntags: [gold, 'silver']\nnotion_page_id:\nai_processed: true\n---\n# T\n"
+    )
+    assert meta == {"date": "2025-01-02", "tags": ["gold", "silver"], "notion_page_id": "", "ai_processed": True}
+    assert body == "# T"
+
+
+def test_parse_frontmatter_keeps_numbers_and_yaml11_booleans_as_strings():
+    meta, _ = _publisher().parse_frontmatter(
+        '---\nversion: 2\nprice: 1.50\nstatus: yes\ndraft: no\npinned: False\nflag: "true"\nlevels: [2000, true]\n---\nb'
+    )
+    assert meta == {
+        "version": "2",
+        "price": "1.50",
+        "status": "yes",
+        "draft": "no",
+        "pinned": False,
+        "flag": "true",
+        "levels": ["2000", "true"],
+    }
+
+
+def test_parse_frontmatter_falls_back_on_invalid_yaml():
+    meta, _ = _publisher().parse_frontmatter("---\ntitle: Gold: Weekly\nstatus: published\n---\nbody")
+    assert meta == {"title": "Gold: Weekly", "status": "published"}
+
+
+def test_sync_all_outputs_collects_results_from_workers(monkeypatch, tmp_path):
+    import scripts.notion_publisher as np_mod
+
+    for name in ("a.md", "b.md", "c.md", "digest_x.md"):
+        (tmp_path / name).write_text("# x")
+
+    def fake_init(self, *args, **kwargs):
+        self.config = type("C", (), {"database_id": "TESTDB"})
+
+    def fake_sync(self, filepath, force=False, dry_run=False):
+        name = Path(filepath).name
+        if name == "b.md":
+            return {"skipped": True, "reason": "unchanged"}
+        if name == "c.md":
+            raise RuntimeError("boom")
+        return {"page_id": "p", "url": "u", "type": "notes"}
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setattr(NotionPublisher, "__init__", fake_init)
+    monkeypatch.setattr(NotionPublisher, "sync_file", fake_sync)
+    monkeypatch.setattr(np_mod, "DB_AVAILABLE", False)
+
+    results = np_mod.sync_all_outputs(str(tmp_path), force=True)
+    assert [r["file"] for r in results["success"]] == ["a.md"]
+    assert [r["file"] for r in results["skipped"]] == ["b.md"]
+    assert results["failed"] == [{"file": "c.md", "error": "boom"}]
+
+
+def test_publish_appends_blocks_beyond_the_create_limit(monkeypatch, tmp_path):
+    import types
+
+    import scripts.cleanup_manager as cm
+    from scripts.notion_publisher import NotionConfig
+
+    calls = {"create": [], "append": []}
+
+    class FakeClient:
+        def __init__(self, auth=None):
+            self.pages = types.SimpleNamespace(
+                create=lambda **k: calls["create"].append(k["children"]) or {"id": "page-1", "url": "u"}
+            )
+            self.blocks = types.SimpleNamespace(
+                children=types.SimpleNamespace(append=lambda **k: calls["append"].append(k["children"]))
+            )
+
+    monkeypatch.setattr(cm, "USAGE_FILE", tmp_path / "usage_stats.json")
+    monkeypatch.setattr("scripts.notion_publisher.Client", FakeClient)
+    monkeypatch.delenv("NOTION_DATA_SOURCE_ID", raising=False)
+    p = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+    monkeypatch.setattr(p, "_get_database_properties", lambda: {})
+
+    content = "\n\n".join(f"para {i}" for i in range(250))
+    p.publish(title="T", content=content, use_enhanced_formatting=False)
+
+    assert [len(c) for c in calls["create"]] == [100]
+    assert [len(c) for c in calls["append"]] == [100, 50]
+    assert calls["append"][-1][-1]["paragraph"]["rich_text"][0]["text"]["content"] == "para 249"
+
+
+def test_iter_blocks_matches_markdown_to_blocks():
+    content = "# Title\n\n- one\n1. two\n> quote\n\n```python\nx = 1\n```\n| a | b |\n|---|---|\n| 1 | 2 |\n---\ntext"
+    p = _publisher()
+    blocks = p.markdown_to_blocks(content)
+    assert list(p.iter_blocks(content)) == blocks
+    assert [b["type"] for b in blocks] == [
+        "heading_1",
+        "bulleted_list_item",
+        "numbered_list_item",
+        "quote",
+        "code",
+        "code",
+        "divider",
+        "paragraph",
+    ]
+
+
+def test_iter_markdown_files_skips_index_and_archive(tmp_path):
+    from scripts.notion_publisher import _iter_markdown_files
+
+    (tmp_path / "reports" / "archive").mkdir(parents=True)
+    (tmp_path / "a.md").write_text("x")
+    (tmp_path / "notes.txt").write_text("x")
+    (tmp_path / "FILE_INDEX.md").write_text("x")
+    (tmp_path / "reports" / "b.md").write_text("x")
+    (tmp_path / "reports" / "archive" / "old.md").write_text("x")
+
+    found = sorted(p.relative_to(tmp_path).as_posix() for p in _iter_markdown_files(str(tmp_path)))
+    assert found == ["a.md", "reports/b.md"]
+
+
+def test_markdown_to_blocks_coalesces_paragraph_lines():
+    blocks = _publisher().markdown_to_blocks("first line\nsecond line\n\nthird\n- item\nfourth")
+    texts = [(b["type"], b[b["type"]]["rich_text"][0]["text"]["content"]) for b in blocks]
+    assert texts == [
+        ("paragraph", "first line\nsecond line"),
+        ("paragraph", "third"),
+        ("bulleted_list_item", "item"),
+        ("paragraph", "fourth"),
+    ]
+
+
+def test_coalesced_paragraph_spans_stay_within_a_line():
+    def spans(text):
+        (block,) = _publisher().markdown_to_blocks(text)
+        return [(r["text"]["content"], r.get("annotations")) for r in block["paragraph"]["rich_text"]]
+
+    assert spans("price 2*3 units\nratio 4*5 here") == [("price 2*3 units\nratio 4*5 here", None)]
+    assert spans("a `b\nc` d") == [("a `b\nc` d", None)]
+    assert spans("*x\ny*") == [("*x\ny*", None)]
+    assert spans("**b** then\n*i*") == [("b", {"bold": True}), (" then\n", None), ("i", {"italic": True})]
+
+
+def test_publish_backs_off_on_rate_limit_without_schema_fallbacks(monkeypatch, tmp_path):
+    import types
+
+    import scripts.cleanup_manager as cm
+    from scripts.notion_publisher import NotionConfig
+
+    class RateLimited(Exception):
+        status = 429
+        code = "rate_limited"
+
+    creates = []
+
+    def create(**kwargs):
+        creates.append(kwargs["properties"])
+        if len(creates) == 1:
+            raise RateLimited("slow down")
+        return {"id": "page-1", "url": "u"}
+
+    class FakeClient:
+        def __init__(self, auth=None):
+            self.pages = types.SimpleNamespace(create=create)
+
+    monkeypatch.setattr(cm, "USAGE_FILE", tmp_path / "usage_stats.json")
+    monkeypatch.setattr("scripts.notion_publisher.Client", FakeClient)
+    monkeypatch.setenv("NOTION_PUBLISH_BASE_DELAY", "0")
+    monkeypatch.delenv("NOTION_DATA_SOURCE_ID", raising=False)
+    p = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+    monkeypatch.setattr(p, "_get_database_properties", lambda: {})
+
+    result = p.publish(title="T", content="---\nstatus: published\n---\nbody", use_enhanced_formatting=False)
+
+    assert result["page_id"] == "page-1"
+    # Both attempts carried the full properties; no minimal title-only create in between
+    assert len(creates) == 2 and all("Status" in props for props in creates)
+
+
+def test_database_properties_are_cached_between_publishes(monkeypatch):
+    from scripts.notion_publisher import NotionConfig
+
+    fetches = []
+
+    def fake_fetch(self):
+        fetches.append(1)
+        return {"Tags": {"type": "multi_select"}} if len(fetches) > 1 else {}
+
+    monkeypatch.setattr("scripts.notion_publisher.Client", lambda auth=None: None)
+    monkeypatch.setattr(NotionPublisher, "_fetch_database_properties", fake_fetch)
+    p = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+
+    assert p._get_database_properties() == {}  # failed lookups are not cached
+    assert p._get_database_properties() == {"Tags": {"type": "multi_select"}}
+    assert p._get_database_properties() == {"Tags": {"type": "multi_select"}}
+    assert len(fetches) == 2
+
+    p._schema_cache_ttl = 0
+    p._get_database_properties()
+    assert len(fetches) == 3
+
+
+def test_concurrent_workers_discover_the_schema_once(monkeypatch):
+    import threading
+    import time
+
+    from scripts.notion_publisher import NotionConfig
+
+    fetches = []
+
+    def slow_fetch(self):
+        fetches.append(1)
+        time.sleep(0.05)
+        return {"Tags": {"type": "multi_select"}}
+
+    monkeypatch.setattr("scripts.notion_publisher.Client", lambda auth=None: None)
+    monkeypatch.setattr(NotionPublisher, "_fetch_database_properties", slow_fetch)
+    p = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+
+    threads = [threading.Thread(target=p._get_database_properties) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(fetches) == 1
+
+
+def test_body_starting_with_a_rule_keeps_its_content():
+    p = _publisher()
+    _, body = p.parse_frontmatter("---\ntitle: T\n---\n---\nintro\n---\nmore")
+    assert [b["type"] for b in p.markdown_to_blocks(body)] == ["divider", "paragraph", "divider", "paragraph"]
+
+
+def test_publish_honours_retry_after_and_stops_on_client_errors(monkeypatch):
+    import types
+
+    import pytest
+
+    from scripts.notion_publisher import NotionConfig
+
+    class NotionError(Exception):
+        def __init__(self, status, code, headers=None):
+            super().__init__(code)
+            self.status, self.code, self.headers = status, code, headers or {}
+
+    errors = [NotionError(429, "rate_limited", {"Retry-After": "7"})]
+    creates = []
+
+    def create(**kwargs):
+        creates.append(kwargs)
+        raise errors[min(len(creates), len(errors)) - 1]
+
+    class FakeClient:
+        def __init__(self, auth=None):
+            self.pages = types.SimpleNamespace(create=create)
+
+    sleeps = []
+    monkeypatch.setattr("scripts.notion_publisher.Client", FakeClient)
+    monkeypatch.setattr("scripts.notion_publisher.time.sleep", sleeps.append)
+    monkeypatch.setattr("scripts.notifier.send_discord", lambda msg: True)
+    monkeypatch.setenv("NOTION_PUBLISH_BASE_DELAY", "1")
+    monkeypatch.delenv("NOTION_DATA_SOURCE_ID", raising=False)
+    p = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+    monkeypatch.setattr(p, "_get_database_properties", lambda: {})
+
+    errors.append(NotionError(400, "validation_error"))
+    with pytest.raises(Exception, match="after 2 attempts"):
+        p.publish(title="T", content="body", use_enhanced_formatting=False)
+
+    # One wait of Retry-After (plus jitter), then the 400 ends the loop without sleeping again
+    assert len(sleeps) == 1 and 7 <= sleeps[0] <= 7.3
+    assert len(creates) == 3  # 429, then the 400 and its minimal title-only fallback
+
+
+def test_normalize_date_accepts_common_formats():
+    from scripts.notion_publisher import _normalize_date
+
+    assert _normalize_date("2025-01-02T10:00:00") == "2025-01-02"
+    assert _normalize_date("2025/1/2") == "2025-01-02"
+    assert _normalize_date("02-01-2025") == "2025-01-02"
+    assert _normalize_date("1/2/2025") == "2025-01-02"
+    assert _normalize_date("2/30/2025") is None
+    assert _normalize_date("soon") is None
+
+
+def test_token_bucket_paces_requests_after_a_burst(monkeypatch):
+    from scripts.notion_publisher import TokenBucket
+
+    now = [100.0]
+    sleeps = []
+    monkeypatch.setattr("scripts.notion_publisher.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("scripts.notion_publisher.time.sleep", sleeps.append)
+
+    bucket = TokenBucket(2)
+    for _ in range(4):
+        bucket.acquire()
+    assert sleeps == [0.5, 1.0]  # burst of 2, then queued one slot apart
+
+    now[0] += 10
+    bucket.acquire()
+    assert len(sleeps) == 2  # refilled while idle
+    TokenBucket(0).acquire()  # disabled
+
+
+def test_env_float_falls_back_on_a_malformed_value(monkeypatch, caplog):
+    from scripts.notion_publisher import _env_float
+
+    monkeypatch.setenv("NOTION_RPS", "fast")
+    assert _env_float("NOTION_RPS", 3.0) == 3.0
+    assert "NOTION_RPS" in caplog.text
+    monkeypatch.setenv("NOTION_RPS", "0.5")
+    assert _env_float("NOTION_RPS", 3.0) == 0.5
+
+
+def test_publish_logs_one_traceback_after_retries(monkeypatch, caplog):
+    import logging
+    import types
+
+    import pytest
+
+    from scripts.notion_publisher import NotionConfig
+
+    class RateLimited(Exception):
+        status = 429
+        code = "rate_limited"
+
+    def create(**kwargs):
+        raise RateLimited("slow down")
+
+    class FakeClient:
+        def __init__(self, auth=None):
+            self.pages = types.SimpleNamespace(create=create)
+
+    monkeypatch.setattr("scripts.notion_publisher.Client", FakeClient)
+    monkeypatch.setattr("scripts.notifier.send_discord", lambda msg: True)
+    monkeypatch.setenv("NOTION_PUBLISH_BASE_DELAY", "0")
+    monkeypatch.setenv("NOTION_PUBLISH_ATTEMPTS", "3")
+    monkeypatch.delenv("NOTION_DATA_SOURCE_ID", raising=False)
+    p = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+    monkeypatch.setattr(p, "_get_database_properties", lambda: {})
+
+    with caplog.at_level(logging.INFO), pytest.raises(Exception):
+        p.publish(title="T", content="body", use_enhanced_formatting=False)
+
+    assert len([r for r in caplog.records if r.levelno == logging.WARNING and "attempt" in r.getMessage()]) == 3
+    assert [r.getMessage() for r in caplog.records if r.exc_info] == ["Final Notion publish failure after 3 attempts"]
+
+
+def test_concurrent_publishes_count_every_page(monkeypatch, tmp_path):
+    import threading
+    import types
+
+    import scripts.cleanup_manager as cm
+    from scripts.notion_publisher import NotionConfig
+
+    class FakeClient:
+        def __init__(self, auth=None):
+            self.pages = types.SimpleNamespace(create=lambda **k: {"id": "page-1", "url": "u"})
+
+    monkeypatch.setattr(cm, "USAGE_FILE", tmp_path / "usage_stats.json")
+    monkeypatch.setattr("scripts.notion_publisher.Client", FakeClient)
+    monkeypatch.delenv("NOTION_DATA_SOURCE_ID", raising=False)
+    p = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+    monkeypatch.setattr(p, "_get_database_properties", lambda: {})
+
+    threads = [
+        threading.Thread(target=p.publish, kwargs={"title": "T", "content": "body", "use_enhanced_formatting": False})
+        for _ in range(16)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cm.CleanupManager().stats.notion_pages_created == 16
+
+
+def test_chart_uploads_overlap_and_keep_every_cache_entry(monkeypatch, tmp_path):
+    import json
+    import threading
+
+    import scripts.chart_publisher as chart_mod
+
+    both_uploading = threading.Barrier(2, timeout=5)
+
+    def upload(self, filepath, name=None):
+        both_uploading.wait()  # times out if uploads are serialized
+        return f"https://i.example/{filepath.name}"
+
+    monkeypatch.setattr(chart_mod, "CACHE_FILE", tmp_path / "chart_urls.json")
+    monkeypatch.setattr(chart_mod.ChartPublisher, "upload_to_imgbb", upload)
+    charts = []
+    for name in ("GOLD.png", "SILVER.png"):
+        charts.append(tmp_path / name)
+        charts[-1].write_bytes(name.encode())
+
+    threads = [threading.Thread(target=chart_mod.ChartPublisher().upload_chart, args=(c,)) for c in charts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(json.loads(chart_mod.CACHE_FILE.read_text())["charts"]) == ["GOLD.png", "SILVER.png"]
+
+
+def test_sync_file_skips_an_unchanged_file_before_reading_it(monkeypatch, tmp_path):
+    import pytest
+
+    import scripts.notion_publisher as np_mod
+    from db_manager import DatabaseManager
+
+    class Read(Exception):
+        pass
+
+    def no_read(self, *args, **kwargs):
+        raise Read(str(self))
+
+    db = DatabaseManager(db_path=tmp_path / "test.db")
+    md = tmp_path / "a.md"
+    md.write_text("# A\n\nbody")
+    db.record_notion_sync(str(md), "page-1", "u", "reports", file_hash="fingerprint")
+
+    monkeypatch.setattr(np_mod, "DB_AVAILABLE", True)
+    monkeypatch.setattr(np_mod, "get_db", lambda: db, raising=False)
+    monkeypatch.setattr(Path, "read_text", no_read)
+
+    res = _publisher().sync_file(str(md))
+    assert (res["skipped"], res["reason"], res["page_id"]) == (True, "File unchanged since last sync", "page-1")
+
+    # A cleared sync row sends the file back through the full checks
+    db.clear_sync_for_file(str(md))
+    with pytest.raises(Read):
+        _publisher().sync_file(str(md))